@@ -390,18 +390,22 @@ async function scriptOnly(){
   }catch(e){alert('Error: '+e);}
   btn.textContent='✎ SCRIPT ONLY';btn.disabled=false;
 }
-async function poll(){
-  if(!RN)return;
-  try{
-    const r=await(await fetch('/api/status')).json();
+/* Run updates stream over /api/events while a run is active (EventSource reconnects on its own) */
+let ES=null,LG=null;
+function poll(){
+  if(!RN||ES)return;
+  ES=new EventSource('/api/events');
+  ES.onmessage=e=>{
+    const r=JSON.parse(e.data);
+    if(r.type==='log'){if(LG){LG.push(r);if(LG.length>200)LG.shift();rLogs();}return;}
     PH=r.phase;PD=r.phases_done||[];
     if(r.result){
       LAST_RESULT=r.result;
       GATE=r.result.gate||null;
     }
-    if(!r.running){RN=false;rP();rPv();return;}
-    RN=true;rP();setTimeout(poll,2000);
-  }catch(e){setTimeout(poll,3000);}
+    if(!r.running){ES.close();ES=null;RN=false;rP();rPv();return;}
+    RN=true;rP();
+  };
 }
 
 /* ═══ TOPICS ═══ */
@@ -459,14 +463,15 @@ async function loadRuns(){
 
 /* ═══ LOGS ═══ */
 async function loadLogs(){
-  try{
-    const logs=await(await fetch('/api/logs')).json();
-    const lvl={ok:'ok',error:'error',info:'info'};
-    const lbl={ok:'OK',error:'ERR',info:'INFO'};
-    const h=logs.length?logs.map(l=>{const lv=lvl[l.level]||'info';return `<div class="log-row lv-${l.level}"><span class="log-ts">${l.t}</span><span class="log-lv ${lv}">${lbl[lv]||'INFO'}</span><span class="log-ph">${l.phase}</span><span class="log-msg${l.level==='error'?' lv-error':''}">${l.msg}</span></div>`;}).join('')+'<div class="log-row" style="border-top:1px solid var(--bd2);margin-top:6px"><span class="log-ts" style="color:var(--txtdd)">[--:--]</span><span style="color:var(--amb);font-weight:700;letter-spacing:2px;font-size:.85em;display:flex;align-items:center;gap:6px"><span style="display:inline-block;width:5px;height:5px;background:var(--amb);border-radius:50%;animation:pulse 1.5s infinite"></span>LISTENING...</span></div>':'<div class="log-row"><span class="log-msg" style="color:var(--txtd)">No events captured.</span></div>';
-    ['d-la','m-la'].forEach(id=>{if($(id))$(id).innerHTML=h;});
-    if($('d-lc'))$('d-lc').textContent=logs.length+' entries';
-  }catch(e){}
+  try{LG=await(await fetch('/api/logs')).json();rLogs();}catch(e){}
+}
+function rLogs(){
+  const logs=LG||[];
+  const lvl={ok:'ok',error:'error',info:'info'};
+  const lbl={ok:'OK',error:'ERR',info:'INFO'};
+  const h=logs.length?logs.map(l=>{const lv=lvl[l.level]||'info';return `<div class="log-row lv-${l.level}"><span class="log-ts">${l.t}</span><span class="log-lv ${lv}">${lbl[lv]||'INFO'}</span><span class="log-ph">${l.phase}</span><span class="log-msg${l.level==='error'?' lv-error':''}">${l.msg}</span></div>`;}).join('')+'<div class="log-row" style="border-top:1px solid var(--bd2);margin-top:6px"><span class="log-ts" style="color:var(--txtdd)">[--:--]</span><span style="color:var(--amb);font-weight:700;letter-spacing:2px;font-size:.85em;display:flex;align-items:center;gap:6px"><span style="display:inline-block;width:5px;height:5px;background:var(--amb);border-radius:50%;animation:pulse 1.5s infinite"></span>LISTENING...</span></div>':'<div class="log-row"><span class="log-msg" style="color:var(--txtd)">No events captured.</span></div>';
+  ['d-la','m-la'].forEach(id=>{if($(id))$(id).innerHTML=h;});
+  if($('d-lc'))$('d-lc').textContent=logs.length+' entries';
 }
 
 /* ═══ PREVIEW ═══ */
@@ -592,9 +597,7 @@ async function rH(){
 }
 async function testAll(){
   alert('Testing connections...');
-  for(const s of['openai','replicate','elevenlabs']){
-    try{await(await fetch('/api/test-connection',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({service:s})})).json();}catch(e){}
-  }
+  await Promise.all(['openai','replicate','elevenlabs'].map(s=>fetch('/api/test-connection',{method:'POST',headers:{'Content-Type':'application/json'},body:JSON.stringify({service:s})}).then(r=>r.json()).catch(e=>null)));
   rH();alert('Done!');
 }
 
@@ -1,17 +1,40 @@
 """
 Knights Reactor — Configuration
 """
-import os, logging
+import os, logging, random
 from pathlib import Path
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s", datefmt="%H:%M:%S")
 log = logging.getLogger("knights")
 
 DATA_DIR = Path("/var/data") if Path("/var/data").exists() else Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
+_ENV = os.environ
+
+# Shared HTTP session — phases reuse keep-alive connections instead of a new TLS
+# handshake per call. urllib3 only retries idempotent methods (GET), so POST
+# callers keep handling their own 429s; raise_on_status=False hands the final
+# response back for the usual raise_for_status().
+HTTP = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(
+    total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False))
+HTTP.mount("https://", _adapter)
+HTTP.mount("http://", _adapter)
+
 def env(key, default=""):
-    return os.environ.get(key, default)
+    return _ENV.get(key, default)
+
+def poll_delays(start: float, cap: float):
+    """Sleep intervals for status polling: start, growing x1.5 up to cap, with ±20% jitter."""
+    interval = start
+    while True:
+        yield min(interval * random.uniform(0.8, 1.2), cap)
+        interval = min(interval * 1.5, cap)
 
 
 class Config:
@@ -22,6 +45,12 @@ class Config:
     IMAGE_QUALITY     = env("IMAGE_QUALITY", "high")
     VIDEO_PROVIDER    = env("VIDEO_PROVIDER", "replicate")
     VIDEO_MODEL       = env("VIDEO_MODEL", "bytedance/seedance-1-lite")
+    REPLICATE_CONCURRENCY = int(env("REPLICATE_CONCURRENCY", "4"))   # predictions in flight per model
+    REPLICATE_MODEL_CONCURRENCY = {"seedance": 4, "grok-imagine": 2}  # model substring → override
+    REPLICATE_POLL_MIN = float(env("REPLICATE_POLL_MIN", "2"))    # first poll interval (s)
+    REPLICATE_POLL_MAX = float(env("REPLICATE_POLL_MAX", "20"))   # backoff cap (s)
+    REPLICATE_CACHE_TTL = int(env("REPLICATE_CACHE_TTL", "3000"))  # reuse identical predictions (s), 0 = off; outputs expire after 1h
+    PUBLIC_URL        = env("PUBLIC_URL")  # set explicitly to enable Replicate webhooks (web server only)
     ELEVEN_KEY        = env("ELEVENLABS_API_KEY")
     VOICE_ID          = env("ELEVENLABS_VOICE_ID", "bwCXcoVxWNYMlC6Esa8u")
     VOICE_MODEL       = "eleven_turbo_v2"
@@ -0,0 +1,19 @@
+"""
+Knights Reactor — OpenAI Chat
+Shared chat-completion call used by the script and caption phases.
+"""
+import orjson
+from config import Config, HTTP
+
+
+def openai_chat(model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """Run one chat completion and return the message text."""
+    r = HTTP.post("https://api.openai.com/v1/chat/completions", headers={
+        "Authorization": f"Bearer {Config.OPENAI_KEY}", "Content-Type": "application/json",
+    }, json={
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature, "max_tokens": max_tokens,
+    })
+    r.raise_for_status()
+    return orjson.loads(r.content)["choices"][0]["message"]["content"]
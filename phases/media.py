@@ -2,20 +2,72 @@
 Knights Reactor — Media Generation
 Replicate (images, videos), ElevenLabs (voiceover), Whisper (transcribe).
 """
-import time, re
-import requests
-from config import Config, log
+import time, re, threading, hashlib, os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from config import Config, DATA_DIR, log, poll_delays, HTTP
+
+_QUOTE_RE = re.compile(r'["""]')
+
+# Providers throttle on concurrent requests, not RPM — cap in-flight calls
+_ELEVEN_SLOTS = threading.BoundedSemaphore(2)  # ElevenLabs free tier allows 2
+_REPLICATE_SLOTS = {}
+_REPLICATE_SLOTS_LOCK = threading.Lock()
+
+
+def _replicate_slots(model: str) -> threading.BoundedSemaphore:
+    """Semaphore capping predictions in flight for a model (Config.REPLICATE_CONCURRENCY,
+    or the first matching Config.REPLICATE_MODEL_CONCURRENCY override)."""
+    limit = next((n for key, n in Config.REPLICATE_MODEL_CONCURRENCY.items() if key in model.lower()),
+                 Config.REPLICATE_CONCURRENCY)
+    with _REPLICATE_SLOTS_LOCK:
+        # Keyed on the limit too, so a settings change takes effect on the next run
+        return _REPLICATE_SLOTS.setdefault((model, limit), threading.BoundedSemaphore(max(int(limit), 1)))
+
+
+# Prediction id → Event, set by the /api/webhook/replicate callback when a job completes
+_WEBHOOK_EVENTS = {}
+# Only the web server receives callbacks — other processes (scheduler.py) keep plain polling
+_WEBHOOK_RECEIVER = False
+
+
+def enable_webhooks():
+    """Called by server.py: this process serves /api/webhook/replicate, so its predictions
+    can ask Replicate for a completion callback (when Config.PUBLIC_URL is set)."""
+    global _WEBHOOK_RECEIVER
+    _WEBHOOK_RECEIVER = True
+
+
+def _webhooks_on() -> bool:
+    return _WEBHOOK_RECEIVER and bool(Config.PUBLIC_URL)
+
+
+def _prediction_id(get_url: str) -> str:
+    return get_url.rstrip("/").rsplit("/", 1)[-1]
+
+
+def replicate_webhook(prediction: dict):
+    """Webhook callback: wake the poller waiting on this prediction.
+    The payload is only a hint — the poller re-fetches the prediction itself."""
+    event = _WEBHOOK_EVENTS.get(str(prediction.get("id", "")))
+    if event:
+        event.set()
+
 
 def replicate_create(model: str, input_data: dict) -> str:
     """Create a Replicate prediction, return the GET URL for polling."""
+    body = {"input": input_data}
+    if _webhooks_on():
+        body["webhook"] = f"{Config.PUBLIC_URL.rstrip('/')}/api/webhook/replicate"
+        body["webhook_events_filter"] = ["completed"]
     for attempt in range(5):
-        r = requests.post(
+        r = HTTP.post(
             f"https://api.replicate.com/v1/models/{model}/predictions",
             headers={
                 "Authorization": f"Bearer {Config.REPLICATE_TOKEN}",
                 "Content-Type": "application/json",
             },
-            json={"input": input_data},
+            json=body,
             timeout=30,
         )
         if r.status_code == 429:
@@ -24,74 +76,148 @@ def replicate_create(model: str, input_data: dict) -> str:
             time.sleep(wait)
             continue
         r.raise_for_status()
-        return r.json()["urls"]["get"]
+        get_url = r.json()["urls"]["get"]
+        if _webhooks_on():
+            _WEBHOOK_EVENTS[_prediction_id(get_url)] = threading.Event()
+        return get_url
     raise Exception("Replicate rate limit: 5 retries exhausted")
 
 
 def replicate_poll(get_url: str, timeout: int = 300) -> str:
-    """Poll a Replicate prediction until complete. Returns output URL."""
+    """Poll a Replicate prediction until complete. Returns output URL.
+    With webhooks on, waits are cut short by the completion callback and the
+    poll itself backs off to a slow fallback."""
     deadline = time.time() + timeout
-    while time.time() < deadline:
-        r = requests.get(get_url, headers={
-            "Authorization": f"Bearer {Config.REPLICATE_TOKEN}",
-        })
-        r.raise_for_status()
-        data = r.json()
-        status = data.get("status")
-
-        if status == "succeeded":
-            output = data.get("output")
-            if isinstance(output, list):
-                return output[0]
-            return output
-        elif status == "failed":
-            raise RuntimeError(f"Replicate failed: {data.get('error')}")
-
-        time.sleep(10)
+    done = _WEBHOOK_EVENTS.get(_prediction_id(get_url))
+    if done:
+        delays = poll_delays(Config.REPLICATE_POLL_MAX, 60)
+    else:
+        delays = poll_delays(Config.REPLICATE_POLL_MIN, Config.REPLICATE_POLL_MAX)
+    try:
+        while time.time() < deadline:
+            r = HTTP.get(get_url, headers={
+                "Authorization": f"Bearer {Config.REPLICATE_TOKEN}",
+            })
+            r.raise_for_status()
+            data = r.json()
+            status = data.get("status")
+
+            if status == "succeeded":
+                output = data.get("output")
+                if isinstance(output, list):
+                    return output[0]
+                return output
+            elif status == "failed":
+                raise RuntimeError(f"Replicate failed: {data.get('error')}")
+            elif status == "canceled":
+                raise RuntimeError("Replicate prediction canceled")
+
+            if done:
+                if done.wait(next(delays)):
+                    # Re-arm for the next callback, and keep a floor between GETs so a
+                    # stale or repeated webhook can't turn this into a busy loop
+                    done.clear()
+                    time.sleep(Config.REPLICATE_POLL_MIN)
+            else:
+                time.sleep(next(delays))
+    finally:
+        _WEBHOOK_EVENTS.pop(_prediction_id(get_url), None)
 
     raise TimeoutError("Replicate prediction timed out")
 
 
-def generate_images(clips: list) -> list:
+# Finished predictions by (topic, model, clip slot, input) — gate re-runs skip clips whose
+# prompt didn't change. The slot is part of the key so cycled clips with a repeated prompt
+# still get their own generation, and the topic so a new topic never reuses another's media.
+_CACHE_DIR = DATA_DIR / "replicate_cache"
+
+
+def _cache_path(run_id: str, model: str, index, input_data: dict):
+    key = hashlib.sha256(orjson.dumps([run_id, model, index, input_data], option=orjson.OPT_SORT_KEYS)).hexdigest()
+    return _CACHE_DIR / f"{key}.json"
+
+
+def _cache_get(path):
+    """Cached (get_url, output_url), or None if missing or older than Config.REPLICATE_CACHE_TTL
+    (Replicate deletes API prediction outputs after an hour)."""
+    try:
+        hit = orjson.loads(path.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if time.time() - hit.get("ts", 0) > Config.REPLICATE_CACHE_TTL:
+        path.unlink(missing_ok=True)
+        return None
+    return hit["get_url"], hit["output"]
+
+
+def _cache_put(path, get_url: str, output: str):
+    try:
+        _CACHE_DIR.mkdir(exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(orjson.dumps({"get_url": get_url, "output": output, "ts": time.time()}))
+        os.replace(tmp, path)
+    except Exception as e:
+        log.warning(f"   Replicate cache write failed: {e}")
+
+
+def _run_clips(clips: list, model: str, params_for, timeout: int = 300, run_id: str = None) -> list:
+    """Submit and poll one prediction per clip concurrently, at most the model's
+    concurrency limit in flight. Returns (get_url, output_url) pairs in clip order.
+    With a run_id (the topic id), identical (model, clip index, input) predictions within
+    Config.REPLICATE_CACHE_TTL are reused — scene prompts repeat across topics, so the
+    cache never crosses topics."""
+    slots = _replicate_slots(model)
+
+    def run(clip):
+        params = params_for(clip)
+        path = _cache_path(run_id, model, clip["index"], params) if run_id and Config.REPLICATE_CACHE_TTL > 0 else None
+        hit = path and _cache_get(path)
+        if hit:
+            log.info(f"   Clip {clip['index']}: reusing cached prediction")
+            return hit
+        with slots:
+            get_url = replicate_create(model, params)
+            log.info(f"   Clip {clip['index']}: submitted")
+            output = replicate_poll(get_url, timeout=timeout)
+        if path:
+            _cache_put(path, get_url, output)
+        return get_url, output
+
+    with ThreadPoolExecutor(max_workers=max(len(clips), 1)) as ex:
+        return list(ex.map(run, clips))
+
+
+# Image models that take prompt + aspect_ratio only; anything else (Flux, SD, ...) also gets quality
+_ASPECT_ONLY_IMAGE_MODELS = (
+    "grok-imagine",  # xAI Grok Aurora
+    "nano-banana",   # Google Nano Banana / Pro
+    "seedream",      # ByteDance Seedream
+    "ideogram",      # Ideogram v3
+    "recraft",       # Recraft v3 (no quality param)
+    "imagen",        # Google Imagen
+)
+
+
+def _image_params(model: str, prompt: str, quality: str) -> dict:
+    """Build Replicate input for an image model (all models support 9:16)."""
+    params = {"prompt": prompt, "aspect_ratio": "9:16"}
+    if not any(family in model for family in _ASPECT_ONLY_IMAGE_MODELS):
+        params["quality"] = quality
+    return params
+
+
+def generate_images(clips: list, run_id: str = None) -> list:
     """Generate cinematic images via Replicate (all models support 9:16)."""
     model = Config.IMAGE_MODEL
     quality = getattr(Config, 'IMAGE_QUALITY', 'high')
     log.info(f"🖼️  Phase 4: Generating images via Replicate ({model}) | Quality: {quality} | Aspect: 9:16")
 
-    for clip in clips:
-        params = {"prompt": clip["image_prompt"]}
-
-        # Model-specific parameter mapping
-        if "grok-imagine" in model:
-            # xAI Grok Aurora — uses prompt + aspect_ratio
-            params["aspect_ratio"] = "9:16"
-        elif "nano-banana" in model:
-            # Google Nano Banana / Pro — uses aspect_ratio
-            params["aspect_ratio"] = "9:16"
-        elif "seedream" in model:
-            # ByteDance Seedream — uses aspect_ratio
-            params["aspect_ratio"] = "9:16"
-        elif "ideogram" in model:
-            # Ideogram v3 — uses aspect_ratio
-            params["aspect_ratio"] = "9:16"
-        elif "recraft" in model:
-            # Recraft v3 — uses aspect_ratio (no quality param)
-            params["aspect_ratio"] = "9:16"
-        elif "imagen" in model:
-            # Google Imagen — uses aspect_ratio
-            params["aspect_ratio"] = "9:16"
-        else:
-            # Flux, SD, and most others
-            params["aspect_ratio"] = "9:16"
-            params["quality"] = quality
-
-        url = replicate_create(model, params)
-        clip["image_poll_url"] = url
-        log.info(f"   Clip {clip['index']}: submitted")
-        time.sleep(8)  # Avoid 429 rate limits
-
-    for clip in clips:
-        clip["image_url"] = replicate_poll(clip["image_poll_url"])
+    def image_params(clip):
+        return _image_params(model, clip["image_prompt"], quality)
+
+    results = _run_clips(clips, model, image_params, run_id=run_id)
+    for clip, (get_url, url) in zip(clips, results):
+        clip["image_poll_url"], clip["image_url"] = get_url, url
         log.info(f"   Clip {clip['index']}: image ready ✓")
 
     return clips
@@ -101,43 +227,33 @@ def generate_images(clips: list) -> list:
 # PHASE 5: GENERATE VIDEOS (Replicate → Seedance-1-Lite)
 # ══════════════════════════════════════════════════════════════
 
-def generate_videos(clips: list) -> list:
+# Video model family → (start-frame input key, extra params).
+# Anything else (Seedance, Wan, Kling, Luma, Veo) takes "image".
+_VIDEO_INPUTS = {
+    "grok-imagine": ("image_url", {"mode": "normal"}),  # xAI Grok Imagine Video
+    "minimax": ("first_frame_image", {}),
+}
+_VIDEO_916_MODELS = ("seedance", "wan")  # pass 9:16 where supported
+
+
+def _video_params(model: str, clip: dict) -> dict:
+    """Build Replicate input for a video model (models accept different params)."""
+    m = model.lower()
+    image_key, extra = next((v for family, v in _VIDEO_INPUTS.items() if family in m), ("image", {}))
+    params = {image_key: clip["image_url"], "prompt": clip["motion_prompt"], **extra}
+    if any(family in m for family in _VIDEO_916_MODELS):
+        params["aspect_ratio"] = "9:16"
+    return params
+
+
+def generate_videos(clips: list, run_id: str = None) -> list:
     """Animate images into videos via configured provider."""
     model = Config.VIDEO_MODEL
     log.info(f"🎥 Phase 5: Generating videos via {model}...")
 
-    # Build params based on model (different models accept different params)
-    for clip in clips:
-        if "grok-imagine" in model.lower():
-            # xAI Grok Imagine Video — uses image_url, mode, prompt
-            params = {
-                "image_url": clip["image_url"],
-                "prompt": clip["motion_prompt"],
-                "mode": "normal",
-            }
-        elif "minimax" in model.lower():
-            # Minimax — uses first_frame_image
-            params = {
-                "first_frame_image": clip["image_url"],
-                "prompt": clip["motion_prompt"],
-            }
-        else:
-            # Most models: Seedance, Wan, Kling, Luma, Veo
-            params = {
-                "image": clip["image_url"],
-                "prompt": clip["motion_prompt"],
-            }
-        # Pass 9:16 where supported
-        if "seedance" in model.lower() or "wan" in model.lower():
-            params["aspect_ratio"] = "9:16"
-
-        url = replicate_create(model, params)
-        clip["video_poll_url"] = url
-        log.info(f"   Clip {clip['index']}: submitted")
-        time.sleep(3)
-
-    for clip in clips:
-        clip["video_url"] = replicate_poll(clip["video_poll_url"], timeout=600)
+    results = _run_clips(clips, model, lambda clip: _video_params(model, clip), timeout=600, run_id=run_id)
+    for clip, (get_url, url) in zip(clips, results):
+        clip["video_poll_url"], clip["video_url"] = get_url, url
         log.info(f"   Clip {clip['index']}: video ready ✓")
 
     return clips
@@ -152,18 +268,10 @@ def generate_video_single(clip: dict) -> dict:
     model = Config.VIDEO_MODEL
     log.info(f"🎥 Regenerating clip {clip.get('index','')} via {model}...")
 
-    if "grok-imagine" in model.lower():
-        params = {"image_url": clip["image_url"], "prompt": clip["motion_prompt"], "mode": "normal"}
-    elif "minimax" in model.lower():
-        params = {"first_frame_image": clip["image_url"], "prompt": clip["motion_prompt"]}
-    else:
-        params = {"image": clip["image_url"], "prompt": clip["motion_prompt"]}
-    if "seedance" in model.lower() or "wan" in model.lower():
-        params["aspect_ratio"] = "9:16"
-
-    url = replicate_create(model, params)
-    clip["video_poll_url"] = url
-    clip["video_url"] = replicate_poll(url, timeout=600)
+    with _replicate_slots(model):
+        url = replicate_create(model, _video_params(model, clip))
+        clip["video_poll_url"] = url
+        clip["video_url"] = replicate_poll(url, timeout=600)
     log.info(f"   Clip {clip.get('index','')}: video regenerated ✓")
     return clip
 
@@ -178,7 +286,7 @@ def generate_voiceover(script: dict) -> bytes:
 
     text = script["script_full"]
     # Clean for ElevenLabs (prevent chuckling)
-    text = re.sub(r'["""]', '', text)
+    text = _QUOTE_RE.sub('', text)
 
     voice_settings = {
         "stability": Config.VOICE_STABILITY,
@@ -189,19 +297,20 @@ def generate_voiceover(script: dict) -> bytes:
     if Config.VOICE_SPEED != 1.0:
         voice_settings["speed"] = Config.VOICE_SPEED
 
-    r = requests.post(
-        f"https://api.elevenlabs.io/v1/text-to-speech/{Config.VOICE_ID}",
-        headers={
-            "xi-api-key": Config.ELEVEN_KEY,
-            "Content-Type": "application/json",
-        },
-        json={
-            "text": text,
-            "model_id": Config.VOICE_MODEL,
-            "voice_settings": voice_settings,
-        },
-        timeout=30,
-    )
+    with _ELEVEN_SLOTS:
+        r = HTTP.post(
+            f"https://api.elevenlabs.io/v1/text-to-speech/{Config.VOICE_ID}",
+            headers={
+                "xi-api-key": Config.ELEVEN_KEY,
+                "Content-Type": "application/json",
+            },
+            json={
+                "text": text,
+                "model_id": Config.VOICE_MODEL,
+                "voice_settings": voice_settings,
+            },
+            timeout=30,
+        )
     r.raise_for_status()
     audio = r.content
     log.info(f"   Voiceover: {len(audio)} bytes")
@@ -216,7 +325,7 @@ def transcribe_voiceover(audio_bytes: bytes) -> dict:
     """Transcribe voiceover for word-level timestamps via Whisper."""
     log.info("📝 Phase 7: Transcribing via OpenAI Whisper...")
 
-    r = requests.post(
+    r = HTTP.post(
         "https://api.openai.com/v1/audio/transcriptions",
         headers={"Authorization": f"Bearer {Config.OPENAI_KEY}"},
         files={"file": ("voiceover.mp3", audio_bytes, "audio/mpeg")},
@@ -228,7 +337,7 @@ def transcribe_voiceover(audio_bytes: bytes) -> dict:
         timeout=30,
     )
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
     words = data.get("words", [])
     log.info(f"   Transcription: {len(words)} words")
     return data
@@ -2,10 +2,16 @@
 Knights Reactor — Publishing
 Caption generation (GPT-4o) and multi-platform publishing (Blotato).
 """
-import json, re
+import re
+import orjson
 from datetime import datetime, timedelta
-import requests
-from config import Config, log
+from concurrent.futures import ThreadPoolExecutor
+from config import Config, log, HTTP
+from phases.llm import openai_chat
+
+# GPT sometimes wraps its JSON in a ```json fence
+_FENCE_OPEN_RE = re.compile(r'^```json\s*\n?', re.IGNORECASE)
+_FENCE_CLOSE_RE = re.compile(r'\n?```\s*$')
 
 CAPTION_PROMPT = """You are a social media expert. Create platform-optimized content from this viral video.
 
@@ -65,25 +71,14 @@ def generate_captions(script: dict, topic: dict) -> dict:
             category=topic["category"],
         )
 
-        r = requests.post("https://api.openai.com/v1/chat/completions", headers={
-            "Authorization": f"Bearer {Config.OPENAI_KEY}",
-            "Content-Type": "application/json",
-        }, json={
-            "model": Config.OPENAI_MODEL,
-            "messages": [{"role": "user", "content": prompt}],
-            "temperature": 0.8,
-            "max_tokens": 2000,
-        })
-        r.raise_for_status()
-
-        text = r.json()["choices"][0]["message"]["content"]
-        raw = re.sub(r'^```json\s*\n?', '', text, flags=re.IGNORECASE)
-        raw = re.sub(r'\n?```\s*$', '', raw).strip()
+        text = openai_chat(Config.OPENAI_MODEL, prompt, 0.8, 2000)
+        raw = _FENCE_OPEN_RE.sub('', text)
+        raw = _FENCE_CLOSE_RE.sub('', raw).strip()
 
         try:
-            parsed = json.loads(raw)
+            parsed = orjson.loads(raw)
             captions.update(parsed)
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             log.warning(f"   Failed to parse {label} captions")
 
     log.info(f"   Captions: {len(captions)} platforms")
@@ -96,7 +91,7 @@ def generate_captions(script: dict, topic: dict) -> dict:
 
 def blotato_upload_media(video_url: str) -> str:
     """Upload video to Blotato, return media URL."""
-    r = requests.post("https://backend.blotato.com/v2/media", headers={
+    r = HTTP.post("https://backend.blotato.com/v2/media", headers={
         "Authorization": f"Bearer {Config.BLOTATO_KEY}",
         "Content-Type": "application/json",
     }, json={"url": video_url})
@@ -125,7 +120,7 @@ def blotato_post(account_id: str, platform: str, caption: str,
     if schedule_time:
         payload["scheduledTime"] = schedule_time
 
-    r = requests.post("https://backend.blotato.com/v2/posts", headers={
+    r = HTTP.post("https://backend.blotato.com/v2/posts", headers={
         "Authorization": f"Bearer {Config.BLOTATO_KEY}",
         "Content-Type": "application/json",
     }, json=payload, timeout=30)
@@ -156,26 +151,29 @@ def publish_everywhere(final_video_url: str, captions: dict, topic: dict):
         "facebook":  tomorrow.replace(hour=19, minute=0).isoformat() + "Z",
     }
 
-    # Video platforms
-    blotato_post(acct["tiktok"], "tiktok", captions.get("tiktok", ""),
-                 [media_url], times["tiktok"],
-                 privacyLevel="PUBLIC_TO_EVERYONE", isAiGenerated=True)
-
-    blotato_post(acct["youtube"], "youtube", captions.get("youtube", ""),
-                 [media_url], times["youtube"],
-                 title=captions.get("youtube_title", topic["idea"]),
-                 privacyStatus="public", shouldNotifySubscribers=True)
-
-    blotato_post(acct["instagram"], "instagram", captions.get("instagram", ""),
-                 [media_url], times["instagram"])
-
-    blotato_post(acct["facebook"], "facebook", captions.get("facebook", ""),
-                 [media_url], times["facebook"],
-                 pageId=acct.get("facebook_page"))
-
-    # Text platforms
-    blotato_post(acct["twitter"], "twitter", captions.get("twitter", ""))
-    blotato_post(acct["threads"], "threads", captions.get("threads", ""))
+    # Each post is an independent call — send them all at once.
+    # Each blotato_post logs its own ✓/✗ line, tagged with the platform.
+    with ThreadPoolExecutor(max_workers=6) as ex:
+        futures = [
+            # Video platforms
+            ex.submit(blotato_post, acct["tiktok"], "tiktok", captions.get("tiktok", ""),
+                      [media_url], times["tiktok"],
+                      privacyLevel="PUBLIC_TO_EVERYONE", isAiGenerated=True),
+            ex.submit(blotato_post, acct["youtube"], "youtube", captions.get("youtube", ""),
+                      [media_url], times["youtube"],
+                      title=captions.get("youtube_title", topic["idea"]),
+                      privacyStatus="public", shouldNotifySubscribers=True),
+            ex.submit(blotato_post, acct["instagram"], "instagram", captions.get("instagram", ""),
+                      [media_url], times["instagram"]),
+            ex.submit(blotato_post, acct["facebook"], "facebook", captions.get("facebook", ""),
+                      [media_url], times["facebook"],
+                      pageId=acct.get("facebook_page")),
+            # Text platforms
+            ex.submit(blotato_post, acct["twitter"], "twitter", captions.get("twitter", "")),
+            ex.submit(blotato_post, acct["threads"], "threads", captions.get("threads", "")),
+        ]
+    for f in futures:
+        f.result()  # surface the first failure, after every platform has had its attempt
 
 
 # ══════════════════════════════════════════════════════════════
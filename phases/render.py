@@ -2,19 +2,82 @@
 Knights Reactor — Render & Storage
 R2 upload, Shotstack video render, SRT generation.
 """
-import time, re
+import time, re, functools, threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import boto3
-from config import Config, log
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
+from config import Config, log, poll_delays, HTTP
 
-def get_s3_client():
+_S3_LOCK = threading.Lock()
+
+# Streamed uploads go multipart in 8 MB parts, 8 in flight — the final render is the big one.
+# Clips are usually under the threshold and go up as a single PUT.
+_TRANSFER = TransferConfig(multipart_threshold=8 << 20, multipart_chunksize=8 << 20, max_concurrency=8)
+
+@functools.lru_cache(maxsize=4)
+def _s3_client(endpoint: str, access_key: str, secret_key: str):
     return boto3.client("s3",
-        endpoint_url=Config.R2_ENDPOINT,
-        aws_access_key_id=Config.R2_ACCESS_KEY,
-        aws_secret_access_key=Config.R2_SECRET_KEY,
+        endpoint_url=endpoint,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
         region_name="auto",
+        config=BotoConfig(max_pool_connections=32, retries={"max_attempts": 5, "mode": "adaptive"}),
     )
 
+def get_s3_client():
+    """Shared R2 client (thread-safe), rebuilt only if the R2 credentials change."""
+    # boto3.client() itself isn't thread-safe — serialize the (rare) construction
+    with _S3_LOCK:
+        return _s3_client(Config.R2_ENDPOINT, Config.R2_ACCESS_KEY, Config.R2_SECRET_KEY)
+
+
+class _PrefixedStream:
+    """Read-only file object: an already-read prefix, then the rest of a raw HTTP body.
+    Lets upload_fileobj stream a download to R2 without holding it all in memory."""
+    def __init__(self, prefix: bytes, raw):
+        self._prefix, self._raw, self.size = prefix, raw, 0
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            chunk, self._prefix = self._prefix + self._raw.read(), b""
+        elif self._prefix:
+            chunk, self._prefix = self._prefix[:n], self._prefix[n:]
+        else:
+            chunk = self._raw.read(n)
+        self.size += len(chunk)
+        return chunk
+
+
+# Magic-byte signatures, checked in order: (test on the first 64 bytes, content type, ext)
+_SNIFF = (
+    # WebM/MKV EBML header, or a 'webm' doctype further into the header
+    (lambda b: b[:4] == b'\x1a\x45\xdf\xa3' or (len(b) >= 64 and b'webm' in b[:64]), "video/webm", "webm"),
+    (lambda b: len(b) >= 8 and (b[4:8] == b'ftyp' or b[:4] in (b'\x00\x00\x00\x18', b'\x00\x00\x00\x1c', b'\x00\x00\x00\x20')),
+     "video/mp4", "mp4"),
+    (lambda b: len(b) >= 3 and (b[:3] == b'ID3' or b[:2] in (b'\xff\xfb', b'\xff\xf3')), "audio/mpeg", "mp3"),
+    (lambda b: b[:4] == b'\x89PNG', "image/png", "png"),
+    (lambda b: b[:2] == b'\xff\xd8', "image/jpeg", "jpg"),
+    (lambda b: b[:4] == b'RIFF' and b[8:12] == b'WEBP', "image/webp", "webp"),
+)
+# Content-type header hints, used when no signature matches
+_HEADER_HINTS = (("mp4", "video/mp4", "mp4"), ("mpeg", "audio/mpeg", "mp3"), ("mp3", "audio/mpeg", "mp3"))
+
+
+def detect_media(head: bytes, hdr_ct: str = "", src_ext: str = "") -> tuple:
+    """Real (content_type, ext) of a file from its first bytes, or (None, None).
+    Order: webm source ext/header (Replicate URLs often end in .webm) → magic bytes → header."""
+    if src_ext == "webm" or "webm" in hdr_ct:
+        return "video/webm", "webm"
+    for test, ct, ext in _SNIFF:
+        if test(head):
+            return ct, ext
+    for hint, ct, ext in _HEADER_HINTS:
+        if hint in hdr_ct:
+            return ct, ext
+    return None, None
+
 
 def upload_to_r2(folder: str, filename: str, data, content_type: str) -> str:
     """Upload a file to R2, return public URL."""
@@ -23,47 +86,29 @@ def upload_to_r2(folder: str, filename: str, data, content_type: str) -> str:
 
     if isinstance(data, bytes):
         # Check if bytes are actually webm when named mp4
-        if filename.endswith(".mp4") and data[:4] == b'\x1a\x45\xdf\xa3':
+        if filename.endswith(".mp4") and detect_media(data[:64])[1] == "webm":
             filename = filename.rsplit(".", 1)[0] + ".webm"
             content_type = "video/webm"
             key = f"{folder}/{filename}"
         s3.put_object(Bucket=Config.R2_BUCKET, Key=key, Body=data, ContentType=content_type)
     elif isinstance(data, str) and data.startswith("http"):
-        # URL — download first, detect real format
-        r = requests.get(data, timeout=120)
+        # URL — stream it through, detecting the real format from the first bytes
+        r = HTTP.get(data, stream=True, timeout=120)
         r.raise_for_status()
-        body = r.content
+        r.raw.decode_content = True
+        head = r.raw.read(64)  # sniff buffer — detect_media looks at 64 bytes at most
         hdr_ct = r.headers.get("content-type", "").split(";")[0].strip().lower()
         src_ext = data.rsplit(".", 1)[-1].split("?")[0].lower() if "." in data else ""
 
-        # Detect format: source URL ext → response header → magic bytes
-        real_ct = content_type
-        is_webm = False
-
-        # 1) Source URL extension (Replicate URLs often end in .webm)
-        if src_ext == "webm" or "webm" in hdr_ct:
-            is_webm = True
-        # 2) Magic bytes: WebM/MKV (EBML header)
-        elif len(body) >= 4 and body[:4] == b'\x1a\x45\xdf\xa3':
-            is_webm = True
-        # 3) Extended WebM detection: check for 'webm' doctype in first 64 bytes
-        elif len(body) >= 64 and b'webm' in body[:64]:
-            is_webm = True
-
-        if is_webm:
-            real_ct = "video/webm"
+        real_ct, ext = detect_media(head, hdr_ct, src_ext)
+        if ext == "webm":
             key = key.rsplit(".", 1)[0] + ".webm"
-        elif len(body) >= 8 and (body[4:8] == b'ftyp' or body[:4] in (b'\x00\x00\x00\x18', b'\x00\x00\x00\x1c', b'\x00\x00\x00\x20')):
-            real_ct = "video/mp4"
-        elif len(body) >= 3 and (body[:3] == b'ID3' or body[:2] == b'\xff\xfb' or body[:2] == b'\xff\xf3'):
-            real_ct = "audio/mpeg"
-        elif "mp4" in hdr_ct:
-            real_ct = "video/mp4"
-        elif "mpeg" in hdr_ct or "mp3" in hdr_ct:
-            real_ct = "audio/mpeg"
-
-        s3.put_object(Bucket=Config.R2_BUCKET, Key=key, Body=body, ContentType=real_ct)
-        log.info(f"   R2 upload: {key} ({real_ct}, {len(body)//1024}KB) [src_ext={src_ext}, hdr={hdr_ct}]")
+        real_ct = real_ct or content_type
+
+        stream = _PrefixedStream(head, r.raw)
+        with r:
+            s3.upload_fileobj(stream, Config.R2_BUCKET, key, ExtraArgs={"ContentType": real_ct}, Config=_TRANSFER)
+        log.info(f"   R2 upload: {key} ({real_ct}, {stream.size//1024}KB) [src_ext={src_ext}, hdr={hdr_ct}]")
     elif isinstance(data, str):
         s3.put_object(Bucket=Config.R2_BUCKET, Key=key, Body=data.encode(), ContentType=content_type)
 
@@ -77,17 +122,23 @@ def upload_assets(folder: str, clips: list, audio: bytes, srt: str) -> dict:
 
     urls = {"clips": []}
 
-    for clip in clips:
-        url = upload_to_r2(folder, f"clip_{clip['index']}.mp4", clip["video_url"], "video/mp4")
-        clip["r2_url"] = url
-        urls["clips"].append(url)
-        log.info(f"   clip_{clip['index']}.mp4 ✓")
+    # Every upload is independent network I/O — run them side by side
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        clip_futs = [ex.submit(upload_to_r2, folder, f"clip_{clip['index']}.mp4", clip["video_url"], "video/mp4")
+                     for clip in clips]
+        vo_fut = ex.submit(upload_to_r2, folder, "voiceover.mp3", audio, "audio/mpeg")
+        srt_fut = ex.submit(upload_to_r2, folder, "subtitles.srt", srt, "text/plain")
+
+        for clip, fut in zip(clips, clip_futs):
+            clip["r2_url"] = fut.result()
+            urls["clips"].append(clip["r2_url"])
+            log.info(f"   clip_{clip['index']}.mp4 ✓")
 
-    urls["voiceover"] = upload_to_r2(folder, "voiceover.mp3", audio, "audio/mpeg")
-    log.info("   voiceover.mp3 ✓")
+        urls["voiceover"] = vo_fut.result()
+        log.info("   voiceover.mp3 ✓")
 
-    urls["srt"] = upload_to_r2(folder, "subtitles.srt", srt, "text/plain")
-    log.info("   subtitles.srt ✓")
+        urls["srt"] = srt_fut.result()
+        log.info("   subtitles.srt ✓")
 
     return urls
 
@@ -207,6 +258,26 @@ def create_srt(script_text: str, transcription: dict = None) -> str:
     return "\n".join(srt_lines) if srt_lines else f"1\n00:00:00,000 --> 00:59:59,000\n{caption_case(script_text, is_first_chunk=True)}\n"
 
 
+@functools.lru_cache(maxsize=1)
+def _rehost_logo(src_url: str, bucket: str, public_url: str) -> str:
+    """Copy the logo onto our R2 bucket, return its public URL.
+    Cached per process — the logo rarely changes, so repeat renders skip the download.
+    One entry only: every logo shares the _assets/logo.* key, so an older entry could be stale."""
+    log.info(f"   Fetching logo from {src_url}...")
+    lr = HTTP.get(src_url, timeout=15)
+    lr.raise_for_status()
+    # Detect format from magic bytes, else trust the content-type
+    body = lr.content
+    ct, ext = detect_media(body[:64])
+    if not ct:
+        ct, ext = lr.headers.get("content-type", "image/png").split(";")[0].strip(), "png"
+    logo_key = f"_assets/logo.{ext}"
+    get_s3_client().put_object(Bucket=bucket, Key=logo_key, Body=body, ContentType=ct)
+    url = f"{public_url}/{logo_key}"
+    log.info(f"   Logo re-uploaded to {url} ({ct}, {len(body)//1024}KB)")
+    return url
+
+
 def render_video(clips: list, voiceover_url: str, srt_url: str, audio_duration: float = 0) -> str:
     """Render final video via Shotstack. Returns download URL.
     
@@ -331,28 +402,12 @@ def render_video(clips: list, voiceover_url: str, srt_url: str, audio_duration:
     if logo_on and Config.LOGO_URL:
         logo_url = Config.LOGO_URL
         # Re-upload logo to our working R2 bucket to guarantee Shotstack can access it
-        try:
-            log.info(f"   Fetching logo from {logo_url}...")
-            lr = requests.get(logo_url, timeout=15)
-            lr.raise_for_status()
-            # Detect format from content-type or magic bytes
-            ct = lr.headers.get("content-type", "image/png").split(";")[0].strip()
-            body = lr.content
-            ext = "png"
-            if body[:4] == b'\x89PNG':
-                ct = "image/png"; ext = "png"
-            elif body[:2] == b'\xff\xd8':
-                ct = "image/jpeg"; ext = "jpg"
-            elif body[:4] == b'RIFF' and body[8:12] == b'WEBP':
-                ct = "image/webp"; ext = "webp"
-            s3 = get_s3_client()
-            logo_key = f"_assets/logo.{ext}"
-            s3.put_object(Bucket=Config.R2_BUCKET, Key=logo_key, Body=body, ContentType=ct)
-            logo_url = f"{Config.R2_PUBLIC_URL}/{logo_key}"
-            log.info(f"   Logo re-uploaded to {logo_url} ({ct}, {len(body)//1024}KB)")
-        except Exception as e:
-            log.warning(f"   Logo fetch/upload failed: {e}, skipping logo overlay")
-            logo_url = None
+        if not (Config.R2_PUBLIC_URL and logo_url.startswith(Config.R2_PUBLIC_URL)):
+            try:
+                logo_url = _rehost_logo(logo_url, Config.R2_BUCKET, Config.R2_PUBLIC_URL)
+            except Exception as e:
+                log.warning(f"   Logo fetch/upload failed: {e}, skipping logo overlay")
+                logo_url = None
 
         if logo_url:
             # Offset map for positions
@@ -406,14 +461,28 @@ def render_video(clips: list, voiceover_url: str, srt_url: str, audio_duration:
             if src:
                 all_asset_urls.append((asset.get("type", "?"), src))
 
-    for atype, aurl in all_asset_urls:
+    def probe(asset):
+        atype, aurl = asset
+        if atype == "caption":
+            return None
+        try:
+            encoded_url = requests.utils.quote(aurl, safe='')
+            return HTTP.get(f"{ss_base}/probe/{encoded_url}",
+                            headers={"x-api-key": Config.SHOTSTACK_KEY}, timeout=15)
+        except Exception as e:
+            return e
+
+    # Probes are independent round trips to Shotstack — fire them together, log in order
+    with ThreadPoolExecutor(max_workers=max(4, len(all_asset_urls))) as ex:
+        probes = list(ex.map(probe, all_asset_urls))
+
+    for (atype, aurl), probe_r in zip(all_asset_urls, probes):
         if atype == "caption":
             log.info(f"   Caption SRT: {aurl.split('/')[-1]} (skip probe)")
             continue
         try:
-            encoded_url = requests.utils.quote(aurl, safe='')
-            probe_r = requests.get(f"{ss_base}/probe/{aurl}",
-                                   headers={"x-api-key": Config.SHOTSTACK_KEY}, timeout=15)
+            if isinstance(probe_r, Exception):
+                raise probe_r
             if probe_r.status_code == 200:
                 probe_data = probe_r.json().get("response", {}).get("metadata", {})
                 streams = probe_data.get("streams", [])
@@ -425,7 +494,7 @@ def render_video(clips: list, voiceover_url: str, srt_url: str, audio_duration:
         except Exception as e:
             log.warning(f"   Probe error for {aurl}: {e}")
 
-    r = requests.post(f"{ss_base}/render", headers={
+    r = HTTP.post(f"{ss_base}/render", headers={
         "x-api-key": Config.SHOTSTACK_KEY,
         "Content-Type": "application/json",
     }, json=payload, timeout=30)
@@ -440,10 +509,12 @@ def render_video(clips: list, voiceover_url: str, srt_url: str, audio_duration:
     job_id = r.json()["response"]["id"]
     log.info(f"   Render job: {job_id}")
 
-    # Poll for completion
-    for _ in range(60):
-        time.sleep(15)
-        r = requests.get(f"{ss_base}/render/{job_id}", headers={
+    # Poll for completion (same 15 min budget as before, backing off 5s → 20s)
+    deadline = time.time() + 900
+    delays = poll_delays(5, 20)
+    while time.time() < deadline:
+        time.sleep(next(delays))
+        r = HTTP.get(f"{ss_base}/render/{job_id}", headers={
             "x-api-key": Config.SHOTSTACK_KEY,
         })
         r.raise_for_status()
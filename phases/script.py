@@ -1,9 +1,10 @@
 """
 Knights Reactor — Script Generation (GPT-4o)
 """
-import json, re
-import requests
+import re
+import orjson
 from config import Config, log
+from phases.llm import openai_chat
 
 CATEGORY_CONFIG = {
     "Shocking Revelations": {
@@ -32,6 +33,7 @@ CATEGORY_CONFIG = {
         "angle": "deep scripture analysis",
     },
 }
+_DEFAULT_CAT_CFG = next(iter(CATEGORY_CONFIG.values()))
 
 
 def build_script_prompt():
@@ -138,27 +140,18 @@ def generate_script(topic: dict) -> dict:
     log.info(f"📝 Phase 2: Generating script via {Config.SCRIPT_MODEL} | Words: {Config.SCRIPT_WORDS} | ~{round(int(Config.SCRIPT_WORDS)/3)}s")
 
     cat = topic["category"]
-    config = CATEGORY_CONFIG.get(cat, list(CATEGORY_CONFIG.values())[0])
+    config = CATEGORY_CONFIG.get(cat, _DEFAULT_CAT_CFG)
     angle = config["angle"]
 
     prompt = build_script_prompt().format(topic=topic["idea"], category=cat, angle=angle)
 
-    r = requests.post("https://api.openai.com/v1/chat/completions", headers={
-        "Authorization": f"Bearer {Config.OPENAI_KEY}", "Content-Type": "application/json",
-    }, json={
-        "model": Config.SCRIPT_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-        "temperature": Config.SCRIPT_TEMP, "max_tokens": 800,
-    })
-    r.raise_for_status()
-
-    text = r.json()["choices"][0]["message"]["content"]
+    text = openai_chat(Config.SCRIPT_MODEL, prompt, Config.SCRIPT_TEMP, 800)
     raw = re.sub(r'^```json\s*\n?', '', text, flags=re.IGNORECASE)
     raw = re.sub(r'\n?```\s*$', '', raw).strip()
 
     try:
-        script = json.loads(raw)
-    except json.JSONDecodeError:
+        script = orjson.loads(raw)
+    except orjson.JSONDecodeError:
         sentences = re.findall(r'[^.!?]+[.!?]+', raw) or [raw]
         script = {
             "hook": sentences[0].strip() if len(sentences) > 0 else "",
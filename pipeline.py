@@ -3,16 +3,20 @@ Knights Reactor — Pipeline Orchestrator v2
 Phases: Topic → Script → Scenes → [GATE: Edit Prompts] → Images → Videos →
         [GATE: Approve Videos] → Voice → Transcribe → Upload → Render → Captions → Publish
 """
-import os, json, time, re, base64
+import json, time, re, base64, gzip
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from config import Config, DATA_DIR, log
+import orjson
+
+from config import Config, DATA_DIR, log, HTTP
 
 # Phase functions
 from phases.topics import fetch_topic, update_topic
 from phases.script import generate_script
 from phases.scenes import scene_engine
 from phases.media import generate_images, generate_videos, generate_video_single, generate_voiceover, transcribe_voiceover
-from phases.render import get_s3_client, upload_to_r2, upload_assets, create_srt, render_video
+from phases.render import get_s3_client, upload_to_r2, upload_assets, create_srt, render_video, detect_media
 from phases.publish import generate_captions, publish_everywhere
 
 # Re-export for server.py imports
@@ -21,6 +25,108 @@ from phases.topics import (
     fetch_next_topic, generate_topics_ai, seed_default_topics,
 )
 
+# Single writer thread: checkpoint writes leave the phase loop but stay in order
+_CKPT_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ckpt")
+# Independent API calls that overlap the main phase sequence
+_BACKGROUND = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pipeline-bg")
+
+_FOLDER_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')  # R2 folder names: ASCII word chars and dashes only
+
+
+# Checkpoints are gzipped orjson — most of the bulk is the base64 voiceover and clip metadata.
+# The file keeps its .json name so existing brand folders and the migration still find it.
+
+def load_checkpoint(path: Path) -> dict:
+    """Read a pipeline checkpoint (plain-JSON checkpoints from older runs still load)."""
+    data = Path(path).read_bytes()
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    return orjson.loads(data)
+
+
+def _dump_checkpoint(path: Path, payload: bytes):
+    # Atomic write — a crash mid-write leaves the previous checkpoint intact
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(gzip.compress(payload, compresslevel=1))
+    tmp.replace(path)
+
+
+def write_checkpoint(path: Path, ckpt: dict):
+    """Replace a checkpoint atomically (used by the gate endpoints in server.py)."""
+    _dump_checkpoint(path, orjson.dumps(ckpt, option=orjson.OPT_NON_STR_KEYS))
+
+
+def _write_checkpoint(path: Path, payload: bytes):
+    try:
+        _dump_checkpoint(path, payload)
+    except Exception as e:
+        log.warning(f"Checkpoint save failed: {e}")
+
+
+def _saved_audio(ckpt: dict):
+    """Voiceover bytes referenced by a checkpoint, or None.
+    Older checkpoints carry the audio inline as base64."""
+    if ckpt.get("audio_path"):
+        try:
+            return Path(ckpt["audio_path"]).read_bytes()
+        except OSError:
+            return None
+    if ckpt.get("audio_b64"):
+        return base64.b64decode(ckpt["audio_b64"])
+    return None
+
+
+def _image_view(clips: list) -> list:
+    """Image summary the dashboard shows at the gates."""
+    return [{"index": c["index"], "url": c["image_url"], "prompt": c.get("image_prompt","")} for c in clips]
+
+
+def _voice_and_transcribe(script: dict) -> tuple:
+    """Phases 5+6 in one go — they only need the script, so they can run beside images/videos."""
+    audio = generate_voiceover(script)
+    return audio, transcribe_voiceover(audio)
+
+
+def _audio_duration(transcription: dict) -> float:
+    """Voiceover length from Whisper: its duration, else the last word's end timestamp."""
+    duration = transcription.get("duration", 0)
+    if not duration and transcription.get("words"):
+        duration = transcription["words"][-1].get("end", 0)
+    return duration
+
+
+def _fixup_clip(clip: dict, s3) -> dict:
+    """Move an R2 clip stored as .mp4 that is really WebM to a .webm key (mutates clip)."""
+    r2_url = clip.get("r2_url", "")
+    prefix = Config.R2_PUBLIC_URL + "/"
+    if not r2_url.startswith(prefix) or not r2_url.endswith(".mp4"):
+        return clip
+    bucket, old_key = Config.R2_BUCKET, r2_url.removeprefix(prefix)
+    try:
+        # Sniff through the S3 API — same auth/pool as the rename, no public-URL round trip
+        obj = s3.get_object(Bucket=bucket, Key=old_key, Range="bytes=0-63")
+        sample = obj["Body"].read(64)
+        ct = obj.get("ContentType", "").lower()
+        is_webm = detect_media(sample, ct)[1] == "webm"
+        log.info(f"   Format check {r2_url.split('/')[-1]}: ct={ct}, magic={sample[:4].hex() if sample else '?'}, webm={is_webm}")
+        if is_webm:
+            log.warning(f"   Fixing {r2_url} — WebM detected, renaming to .webm")
+            new_key = old_key.rpartition(".")[0] + ".webm"
+            try:
+                # Server-side copy — the clip bytes never leave R2
+                s3.copy_object(Bucket=bucket, Key=new_key, CopySource={"Bucket": bucket, "Key": old_key},
+                               ContentType="video/webm", MetadataDirective="REPLACE")
+            except Exception as e:
+                log.warning(f"   CopyObject failed ({e}), streaming the clip instead")
+                body = s3.get_object(Bucket=bucket, Key=old_key)["Body"]
+                s3.upload_fileobj(body, bucket, new_key, ExtraArgs={"ContentType": "video/webm"})
+            clip["r2_url"] = f"{Config.R2_PUBLIC_URL}/{new_key}"
+            log.info(f"   Fixed: {clip['r2_url']}")
+    except Exception as e:
+        log.warning(f"   Format check failed for {r2_url}: {e}")
+    return clip
+
 
 def run_pipeline(progress_cb=None, resume_from: int = 0, topic_id: str = None, 
                  manual_clips: list = None, manual_voiceover: str = None) -> dict:
@@ -46,7 +152,8 @@ def run_pipeline(progress_cb=None, resume_from: int = 0, topic_id: str = None,
     _ab_file = DATA_DIR / "active_brand.txt"
     _brand = _ab_file.read_text().strip() if _ab_file.exists() else "knights"
     _bd = _brands_dir / _brand; _bd.mkdir(exist_ok=True)
-    CHECKPOINT_FILE = str(_bd / "pipeline_checkpoint.json")
+    CHECKPOINT_FILE = _bd / "pipeline_checkpoint.json"
+    AUDIO_FILE = _bd / "pipeline_voiceover.mp3"  # raw voiceover, referenced from the checkpoint
     start = time.time()
     result = {"status": "running", "phases": [], "error": None}
 
@@ -54,26 +161,57 @@ def run_pipeline(progress_cb=None, resume_from: int = 0, topic_id: str = None,
     ckpt = {}
     if resume_from > 0:
         try:
-            with open(CHECKPOINT_FILE, "r") as f:
-                ckpt = json.load(f)
+            ckpt = load_checkpoint(CHECKPOINT_FILE)
             log.info(f"♻️  Resuming from phase {resume_from} (checkpoint loaded)")
         except Exception as e:
             log.error(f"No checkpoint found: {e}")
             return {"status": "failed", "error": f"No checkpoint found for resume: {e}", "phases": []}
 
+    last_write = [None]
+
     def save_checkpoint(phase_idx, data):
         ckpt.update(data)
         ckpt["_last_phase"] = phase_idx
         try:
-            with open(CHECKPOINT_FILE, "w") as f:
-                json.dump(ckpt, f)
+            # Snapshot now — later phases mutate the clip dicts in place
+            payload = orjson.dumps(ckpt, option=orjson.OPT_NON_STR_KEYS)
         except Exception as e:
             log.warning(f"Checkpoint save failed: {e}")
+            return
+        last_write[0] = _CKPT_WRITER.submit(_write_checkpoint, CHECKPOINT_FILE, payload)
+
+    def stash_audio(audio):
+        # Written before the checkpoint that points at it is queued
+        AUDIO_FILE.write_bytes(audio)
+        return {"audio_path": str(AUDIO_FILE)}
+
+    def flush_checkpoint():
+        # Gates hand off to server.py, which reads the file straight away
+        if last_write[0]:
+            last_write[0].result()
+
+    voice_fut = captions_fut = None
+
+    def park_background():
+        # A failed run still collects work already running in _BACKGROUND and parks it in
+        # the checkpoint (phase unchanged), so the resume doesn't pay ElevenLabs/Whisper/GPT again
+        if voice_fut and "transcription" not in ckpt:
+            try:
+                audio, transcription = voice_fut.result()
+                save_checkpoint(ckpt.get("_last_phase", 0), {**stash_audio(audio), "transcription": transcription,
+                                                            "audio_duration": _audio_duration(transcription)})
+            except Exception as e:
+                log.warning(f"   Early voiceover failed too: {e}")
+        if captions_fut and "captions" not in ckpt:
+            try:
+                save_checkpoint(ckpt.get("_last_phase", 0), {"captions": captions_fut.result()})
+            except Exception as e:
+                log.warning(f"   Early captions failed too: {e}")
 
     def notify(idx, name, status):
         if progress_cb:
             try: progress_cb(idx, name, status)
-            except: pass
+            except Exception: pass
 
     try:
         # ── Phase 0: Fetch topic ────────────────────────────────
@@ -171,35 +309,49 @@ def run_pipeline(progress_cb=None, resume_from: int = 0, topic_id: str = None,
                 result["phases"].append({"name": "Scene Engine", "status": "done"})
                 notify(2, "Scene Engine", "done")
 
+            # Voiceover + transcription don't depend on the clips — run them alongside
+            # images/videos and park the results in the checkpoint at the video gate.
+            # Skipped when the checkpoint already has them (e.g. re-generating rejected videos).
+            if resume_from <= 4 and _saved_audio(ckpt) is None and "transcription" not in ckpt:
+                voice_fut = _BACKGROUND.submit(_voice_and_transcribe, script)
+
             # ── Phase 3: Generate images ────────────────────────────
             if resume_from <= 3:
                 notify(3, "Generate Images", "running")
-                clips = generate_images(clips) if resume_from < 3 else (ckpt.get("clips_with_images") or generate_images(clips))
+                clips = generate_images(clips, topic["id"]) if resume_from < 3 else (ckpt.get("clips_with_images") or generate_images(clips, topic["id"]))
                 result["phases"].append({"name": "Generate Images", "status": "done"})
-                result["images"] = [{"index": c["index"], "url": c["image_url"], "prompt": c.get("image_prompt","")} for c in clips]
+                result["images"] = _image_view(clips)
                 save_checkpoint(3, {"clips_with_images": clips})
                 notify(3, "Generate Images", "done")
             else:
                 clips = ckpt["clips_with_images"]
-                result["images"] = [{"index": c["index"], "url": c["image_url"], "prompt": c.get("image_prompt","")} for c in clips]
+                result["images"] = _image_view(clips)
                 result["phases"].append({"name": "Generate Images", "status": "done"})
                 notify(3, "Generate Images", "done")
 
             # ── Phase 4: Generate videos ────────────────────────────
             if resume_from <= 4:
                 notify(4, "Generate Videos", "running")
-                clips = generate_videos(clips) if resume_from < 4 else (ckpt.get("clips_with_videos") or generate_videos(clips))
+                clips = generate_videos(clips, topic["id"]) if resume_from < 4 else (ckpt.get("clips_with_videos") or generate_videos(clips, topic["id"]))
                 result["phases"].append({"name": "Generate Videos", "status": "done"})
                 result["videos"] = [{"index": c["index"], "url": c["video_url"]} for c in clips]
                 save_checkpoint(4, {"clips_with_videos": clips})
                 notify(4, "Generate Videos", "done")
 
+                if voice_fut:
+                    try:
+                        audio, transcription = voice_fut.result()
+                        save_checkpoint(4, {**stash_audio(audio), "transcription": transcription,
+                                            "audio_duration": _audio_duration(transcription)})
+                    except Exception as e:
+                        log.warning(f"   Early voiceover failed ({e}) — will retry after approval")
+
                 # ═══ GATE 2: Video Approval ═══
                 result["status"] = "awaiting_video_approval"
                 result["gate"] = "videos"
                 result["gate_phase"] = 5
                 result["clips"] = clips
-                result["images"] = [{"index": c["index"], "url": c["image_url"], "prompt": c.get("image_prompt","")} for c in clips]
+                result["images"] = _image_view(clips)
                 result["script"] = script
                 log.info("⏸️  Gate 2: Awaiting video approval — review clips then resume")
                 return result
@@ -209,43 +361,47 @@ def run_pipeline(progress_cb=None, resume_from: int = 0, topic_id: str = None,
                 result["phases"].append({"name": "Generate Videos", "status": "done"})
                 notify(4, "Generate Videos", "done")
 
+        # Captions only need the script — write them while voice/transcribe/upload/render run.
+        # (Full manual mode rewrites the script from the transcript, so it has to wait.)
+        # Skipped when a failed run already parked them in the checkpoint.
+        if not full_manual and resume_from <= 9 and "captions" not in ckpt:
+            captions_fut = _BACKGROUND.submit(generate_captions, script, topic)
+
         # ── Phase 5: Voiceover ──────────────────────────────────
+        saved_audio = _saved_audio(ckpt)
         if manual_voiceover:
             # Full manual mode — download provided voiceover
             notify(5, "Voiceover", "running")
             log.info(f"🔊 Phase 5: Using manual voiceover: {manual_voiceover[:80]}...")
-            import requests as rq
-            vo_r = rq.get(manual_voiceover, timeout=120, allow_redirects=True)
+            vo_r = HTTP.get(manual_voiceover, timeout=120, allow_redirects=True)
             vo_r.raise_for_status()
             audio = vo_r.content
             log.info(f"   Manual voiceover: {len(audio)} bytes ({len(audio)//1024}KB)")
             result["phases"].append({"name": "Voiceover", "status": "done"})
             result["voiceover_size"] = len(audio)
-            save_checkpoint(5, {"audio_b64": base64.b64encode(audio).decode()})
+            save_checkpoint(5, stash_audio(audio))
             notify(5, "Voiceover", "done")
-        elif resume_from <= 5:
+        elif resume_from <= 5 and saved_audio is None:
             notify(5, "Voiceover", "running")
             audio = generate_voiceover(script)
             result["phases"].append({"name": "Voiceover", "status": "done"})
             result["voiceover_size"] = len(audio)
-            save_checkpoint(5, {"audio_b64": base64.b64encode(audio).decode()})
+            save_checkpoint(5, stash_audio(audio))
             notify(5, "Voiceover", "done")
         else:
-            audio = base64.b64decode(ckpt["audio_b64"])
+            if saved_audio is None:
+                raise RuntimeError(f"Voiceover audio missing from checkpoint ({ckpt.get('audio_path')})")
+            audio = saved_audio
             result["voiceover_size"] = len(audio)
             result["phases"].append({"name": "Voiceover", "status": "done"})
             notify(5, "Voiceover", "done")
 
         # ── Phase 6: Transcribe ─────────────────────────────────
-        if resume_from <= 6:
+        if resume_from <= 6 and "transcription" not in ckpt:
             notify(6, "Transcribe", "running")
             transcription = transcribe_voiceover(audio)
             result["phases"].append({"name": "Transcribe", "status": "done"})
-            # Extract actual audio duration from Whisper
-            audio_duration = transcription.get("duration", 0)
-            if not audio_duration and transcription.get("words"):
-                # Fallback: last word's end timestamp
-                audio_duration = transcription["words"][-1].get("end", 0)
+            audio_duration = _audio_duration(transcription)  # actual audio duration from Whisper
             log.info(f"   ⏱️  Audio duration: {audio_duration:.1f}s")
             save_checkpoint(6, {"transcription": transcription, "audio_duration": audio_duration})
             notify(6, "Transcribe", "done")
@@ -255,7 +411,6 @@ def run_pipeline(progress_cb=None, resume_from: int = 0, topic_id: str = None,
                 transcript_text = transcription.get("text", "")
                 if transcript_text:
                     log.info(f"🧠 Deriving topic from transcript ({len(transcript_text)} chars)...")
-                    import requests as rq
                     derive_prompt = f"""Listen to this voiceover transcript and extract:
 1. A short topic/title (5-10 words) that describes what this is about
 2. A category from this list: Shocking Revelations, Behind-the-Scenes, Myths Debunked, Deep Dive Analysis, Shocking Reveal
@@ -266,7 +421,7 @@ Transcript: "{transcript_text}"
 Return JSON only:
 {{"idea": "short topic title", "category": "category name", "scripture": "verse or none"}}"""
                     try:
-                        dr = rq.post("https://api.openai.com/v1/chat/completions", headers={
+                        dr = HTTP.post("https://api.openai.com/v1/chat/completions", headers={
                             "Authorization": f"Bearer {Config.OPENAI_KEY}",
                             "Content-Type": "application/json",
                         }, json={
@@ -306,7 +461,7 @@ Return JSON only:
         if resume_from <= 7:
             notify(7, "Upload Assets", "running")
             folder = f"{topic['id']}_{topic['idea'][:30]}"
-            folder = re.sub(r'[^a-zA-Z0-9_-]', '_', folder)
+            folder = _FOLDER_UNSAFE_RE.sub('_', folder)
             srt = create_srt(script["script_full"], transcription)
             urls = upload_assets(folder, clips, audio, srt)
             result["phases"].append({"name": "Upload to R2", "status": "done"})
@@ -322,36 +477,11 @@ Return JSON only:
         # ── Phase 8: Final render ──────────────────────────────
         if resume_from <= 8:
             notify(8, "Final Render", "running")
-            # Fix-up: ensure R2 clips have correct format/extension
+            # Fix-up: ensure R2 clips have correct format/extension (independent per clip)
             s3 = get_s3_client()
-            for clip in clips:
-                r2_url = clip.get("r2_url", "")
-                if not r2_url or not r2_url.endswith(".mp4"):
-                    continue
-                try:
-                    import requests as rq
-                    pr = rq.get(r2_url, timeout=15, headers={"Range": "bytes=0-63"})
-                    if pr.status_code in (200, 206):
-                        sample = pr.content[:64]
-                    else:
-                        sample = b''
-                    ct = pr.headers.get("content-type", "").lower()
-                    is_webm = (
-                        (len(sample) >= 4 and sample[:4] == b'\x1a\x45\xdf\xa3') or
-                        (len(sample) >= 64 and b'webm' in sample[:64]) or
-                        "webm" in ct
-                    )
-                    log.info(f"   Format check {r2_url.split('/')[-1]}: ct={ct}, magic={sample[:4].hex() if sample else '?'}, webm={is_webm}")
-                    if is_webm:
-                        log.warning(f"   Fixing {r2_url} — WebM detected, renaming to .webm")
-                        full = rq.get(r2_url, timeout=120)
-                        old_key = r2_url.split(Config.R2_PUBLIC_URL + "/")[-1]
-                        new_key = old_key.rsplit(".", 1)[0] + ".webm"
-                        s3.put_object(Bucket=Config.R2_BUCKET, Key=new_key, Body=full.content, ContentType="video/webm")
-                        clip["r2_url"] = f"{Config.R2_PUBLIC_URL}/{new_key}"
-                        log.info(f"   Fixed: {clip['r2_url']}")
-                except Exception as e:
-                    log.warning(f"   Format check failed for {r2_url}: {e}")
+            if clips:
+                with ThreadPoolExecutor(max_workers=min(16, len(clips))) as ex:
+                    list(ex.map(lambda clip: _fixup_clip(clip, s3), clips))
 
             final_url = render_video(clips, urls["voiceover"], urls["srt"], audio_duration=audio_duration)
             final_r2_url = upload_to_r2(folder, "final.mp4", final_url, "video/mp4")
@@ -368,7 +498,7 @@ Return JSON only:
         # ── Phase 9: Captions ──────────────────────────────────
         if resume_from <= 9:
             notify(9, "Captions", "running")
-            captions = generate_captions(script, topic)
+            captions = captions_fut.result() if captions_fut else (ckpt.get("captions") or generate_captions(script, topic))
             result["phases"].append({"name": "Generate Captions", "status": "done"})
             save_checkpoint(9, {"captions": captions})
             notify(9, "Captions", "done")
@@ -391,8 +521,9 @@ Return JSON only:
         result["duration"] = f"{elapsed}s"
         log.info(f"\n✅ Pipeline complete in {elapsed}s — {final_r2_url}")
 
-        try: os.remove(CHECKPOINT_FILE)
-        except: pass
+        flush_checkpoint()
+        CHECKPOINT_FILE.unlink(missing_ok=True)
+        AUDIO_FILE.unlink(missing_ok=True)
 
     except Exception as e:
         result["status"] = "failed"
@@ -403,6 +534,11 @@ Return JSON only:
         if "topic" in result:
             update_topic(result["topic"]["id"], {"Status": "Failed", "Error": str(e)})
 
+        park_background()
+
+    finally:
+        flush_checkpoint()
+
     return result
 
 
@@ -11,7 +11,7 @@ Or use cron:
   0 */8 * * * cd /path/to/knights-reactor && python -c "from pipeline import run_pipeline; run_pipeline()"
 """
 
-import sys, time, logging
+import sys, time, signal, threading, logging
 from datetime import datetime
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
@@ -38,7 +38,18 @@ def main():
     log.info(f"   Interval: every {interval_hours} hours")
     log.info(f"   Press Ctrl+C to stop")
 
-    while True:
+    # Wakeable sleep: SIGTERM/Ctrl+C stop the loop right away instead of after the interval.
+    # The handlers are only installed around the wait — during a run the defaults apply,
+    # so Ctrl+C raises KeyboardInterrupt inside run_pipeline and SIGTERM kills it as before.
+    stop = threading.Event()
+    def wakeable(on: bool):
+        signal.signal(signal.SIGTERM, (lambda *_: stop.set()) if on else signal.SIG_DFL)
+        signal.signal(signal.SIGINT, (lambda *_: stop.set()) if on else signal.default_int_handler)
+
+    # Runs are pinned to start + k*interval on the monotonic clock, so run time
+    # doesn't push the schedule back and NTP steps don't move it
+    deadline = time.monotonic()
+    while not stop.is_set():
         log.info(f"\n{'='*50}")
         log.info(f"Starting pipeline run at {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
@@ -48,11 +59,20 @@ def main():
         except Exception as e:
             log.error(f"Pipeline crashed: {e}")
 
-        next_run = datetime.now().timestamp() + interval_secs
-        next_time = datetime.fromtimestamp(next_run).strftime('%I:%M %p')
+        deadline += interval_secs
+        now = time.monotonic()
+        while interval_secs and deadline <= now:  # run overran one or more slots — skip them rather than burst
+            deadline += interval_secs
+        sleep_for = deadline - now
+        next_time = datetime.fromtimestamp(time.time() + sleep_for).strftime('%I:%M %p')
         log.info(f"Next run at {next_time}")
 
-        time.sleep(interval_secs)
+        wakeable(True)
+        if stop.wait(sleep_for):
+            break
+        wakeable(False)
+
+    log.info("Scheduler stopped")
 
 
 if __name__ == "__main__":
@@ -3,13 +3,29 @@ One-time seed script: Creates /var/data/brands/attic_magic/ with settings.json a
 Extracted from Content_Reactor_v6 n8n workflow.
 Run once, then delete or ignore.
 """
-import json
+
+import os
 from pathlib import Path
 
-DATA_DIR = Path("/var/data") if Path("/var/data").exists() else Path(__file__).parent / "data"
+import orjson
+
+from config import DATA_DIR
+
 BRAND_DIR = DATA_DIR / "brands" / "attic_magic"
 BRAND_DIR.mkdir(parents=True, exist_ok=True)
 
+# Scene pack (AI Visual Prompter SEALCaM) and topics (Airtable export) ship as
+# JSON next to this script, so seeding is a byte copy rather than building them.
+_DEFAULT_SCENES_FILE = Path(__file__).resolve().parent / "attic_magic_scenes_default.json"
+_DEFAULT_TOPICS_FILE = Path(__file__).resolve().parent / "attic_magic_topics_default.json"
+
+
+def _write(path, data):
+    """Write via a tmp sibling + os.replace so a crash never leaves a truncated file."""
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
 # ═══════════════════════════════════════════════════════════
 # SETTINGS (Brand identity extracted from n8n workflow)
 # ═══════════════════════════════════════════════════════════
@@ -147,370 +163,6 @@ settings = {
     }
 }
 
-# ═══════════════════════════════════════════════════════════
-# SCENES.JSON (Scene pack from AI Visual Prompter SEALCaM)
-# ═══════════════════════════════════════════════════════════
-scenes = {
-    "figures": [
-        "single-story 1990s brick ranch, red-brown brick, dark charcoal shingles, white fascia, concrete driveway with hairline cracks, mature live oaks, St. Augustine lawn",
-        "two-story traditional 2000s production home, beige stucco, stone veneer accents, 30-year architectural shingles, street-facing two-car garage, knockout roses",
-        "1980s Perry home, hardy plank siding, weathered brown shingles, white vinyl soffits, aluminum gutters, crepe myrtles bare branches, muted winter lawn",
-        "single-story David Weekley ranch, red brick with stone accents, dark charcoal roof, white trim, St. Augustine lawn with brown patches, pale winter sky",
-        "two-story KB Home traditional, beige stucco and brick blend, dark shingles, concrete driveway, mailbox cluster nearby, live oaks mostly green"
-    ],
-
-    "themes": {
-        "insulation": ["insulation", "R-value", "blown-in", "fiberglass", "cellulose", "batt", "thermal", "heat transfer", "conduction"],
-        "ventilation": ["ventilation", "airflow", "soffit", "ridge vent", "attic fan", "circulation", "exhaust", "intake", "breathing"],
-        "energy": ["energy", "bill", "cost", "expensive", "AC", "HVAC", "cooling", "heating", "thermostat", "electricity", "power"],
-        "moisture": ["moisture", "humidity", "mold", "condensation", "water", "leak", "vapor", "barrier", "damp", "wet"],
-        "damage": ["damage", "storm", "hurricane", "wind", "rain", "flood", "disaster", "emergency", "destroyed", "broken"],
-        "pests": ["rats", "mice", "pest", "rodent", "squirrel", "raccoon", "animal", "infestation", "droppings", "nesting"],
-        "comfort": ["comfort", "hot", "cold", "stuffy", "room", "upstairs", "second floor", "uneven", "temperature", "cool"],
-        "myth": ["myth", "wrong", "lie", "scam", "fake", "mislead", "misconception", "debunk", "truth", "fact"],
-        "contractor": ["contractor", "install", "job", "work", "crew", "professional", "DIY", "hired", "company", "service"],
-        "savings": ["save", "savings", "rebate", "ROI", "payback", "investment", "value", "worth", "cheap", "afford"]
-    },
-
-    "moods": {
-        "standard": "Editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text. Cool winter daylight 4200K, low sun angle 20-35 degrees, soft shadows.",
-        "dramatic": "Editorial realism, dramatic lighting, 24fps, subtle film grain, photorealistic, no text. Dark ominous atmosphere, strong contrast, unsettling tone.",
-        "storm": "Editorial realism, disaster footage aesthetic, 24fps, subtle film grain, photorealistic, no text. Dark storm light 3000K, dramatic contrast.",
-        "fire": "Editorial realism, emergency footage, 24fps, grain, photorealistic, no text. Orange fire glow 2000K mixed with blue emergency lights.",
-        "horror": "Editorial realism, horror film aesthetic, 24fps, grain, photorealistic, no text. Dim purple-blue dusk 3000K, minimal ambient, heavy shadows.",
-        "interior": "Editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text. Soft afternoon light 4300K, warm interior tones."
-    },
-
-    "stories": [
-        {
-            "name": "standard_home_exterior",
-            "themes": ["insulation", "ventilation", "energy", "comfort", "myth", "contractor"],
-            "mood": "standard",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "North Houston subdivision, muted winter lawn, pale blue sky, front facade only",
-                    "lighting": "cool winter daylight 4200K, low sun angle, soft shadows",
-                    "atmosphere": "pale blue or light overcast sky, longer softer shadows",
-                    "composition": "24mm WS, deep focus f/8",
-                    "camera": "slow dolly 6 in/sec",
-                    "subject": "Front facade of home, no AC units visible",
-                    "ambient": "Muted winter lawn, bare crepe myrtles",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "dim attic interior, ladder opening glow below",
-                    "lighting": "motivated hatch light 3200K, soft falloff",
-                    "atmosphere": "dusty look, cobwebs in corners, no floating particles",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Attic floor between 2x6 joists, gray cellulose 3 inches deep, bare drywall spots, silver flex duct",
-                    "ambient": "Pull-down attic ladder opening with light spill",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "beige living room, microfiber sofa background",
-                    "lighting": "soft afternoon light 4300K through window, warm interior fill",
-                    "atmosphere": "comfortable home, calm, clean",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window with sheer curtain fully still",
-                    "ambient": "Knockdown ceiling texture, honey oak cabinets",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "hurricane_drama",
-            "themes": ["damage", "energy", "insulation"],
-            "mood": "storm",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "residential neighborhood under extreme weather, chaos, emergency",
-                    "lighting": "dark storm light 3000K, dramatic contrast",
-                    "atmosphere": "dark ominous clouds, destruction",
-                    "composition": "24mm WS, deep focus f/8",
-                    "camera": "slow dolly 6 in/sec",
-                    "subject": "Massive hurricane winds tearing houses apart, debris flying",
-                    "ambient": "Emergency atmosphere",
-                    "pace": "editorial realism, disaster footage aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "dim attic interior, storm damage visible",
-                    "lighting": "motivated hatch light 3200K, soft falloff",
-                    "atmosphere": "water stains, displaced insulation",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Storm-damaged attic floor, displaced cellulose, exposed joists, water marks",
-                    "ambient": "Damaged attic space",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "beige living room after repairs, calm atmosphere",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "comfortable restored home",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window with sheer curtain, comfort restored",
-                    "ambient": "Clean interior, warm tones",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "money_burning",
-            "themes": ["energy", "savings", "insulation", "myth"],
-            "mood": "dramatic",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "dark background, isolated focus on burning money",
-                    "lighting": "orange fire glow 2200K, dramatic shadows",
-                    "atmosphere": "flames consuming currency, dramatic destruction",
-                    "composition": "50mm MS, shallow DOF f/2.8",
-                    "camera": "static 0 in/sec",
-                    "subject": "Stack of cash bills on fire, flames consuming currency",
-                    "ambient": "Dark isolated background",
-                    "pace": "editorial realism, dramatic metaphor, 24fps, grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "dim attic interior, problem insulation visible",
-                    "lighting": "motivated hatch light 3200K, soft falloff",
-                    "atmosphere": "dusty settled insulation, bare spots",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Attic floor with thin settled cellulose, gaps showing drywall, flex duct crossing joists",
-                    "ambient": "Ladder opening glow below",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "comfortable living room, restored comfort",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "calm home, stable temperature",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window with sheer curtain fully still",
-                    "ambient": "Warm interior tones",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "haunted_attic",
-            "themes": ["pests", "damage", "moisture"],
-            "mood": "horror",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "dim hallway, ominous atmosphere, looking up at attic hatch",
-                    "lighting": "single harsh bulb 2700K, dramatic shadows",
-                    "atmosphere": "dark attic hatch opening, shadows pressing in",
-                    "composition": "35mm MS looking up, shallow DOF f/2.8",
-                    "camera": "static 0 in/sec",
-                    "subject": "Dark attic hatch opening viewed from below, single bare lightbulb",
-                    "ambient": "Ominous hallway shadows",
-                    "pace": "editorial realism, suspense aesthetic, 24fps, grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "dark attic space, problem area revealed",
-                    "lighting": "dim ambient 2800K, dramatic shadows",
-                    "atmosphere": "confined space, textured surfaces, pest evidence",
-                    "composition": "85mm CU, shallow DOF f/2.8",
-                    "camera": "static 0 in/sec",
-                    "subject": "Disturbed insulation, rodent damage, displaced fiberglass batts",
-                    "ambient": "Dark confined attic space",
-                    "pace": "editorial realism, pest documentation, 24fps, grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "bright clean living room, problem solved",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "comfortable home, fresh clean feel",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window with sheer curtain, comfort and safety restored",
-                    "ambient": "Clean bright interior",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "swat_raid",
-            "themes": ["contractor", "myth"],
-            "mood": "dramatic",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "suburban street, intense law enforcement presence",
-                    "lighting": "mixed emergency lights with ambient 4000K",
-                    "atmosphere": "tactical team, police vehicles, emergency lights",
-                    "composition": "24mm WS, deep focus f/8",
-                    "camera": "slow dolly 6 in/sec",
-                    "subject": "Tactical team in formation outside house, police vehicles, emergency lights",
-                    "ambient": "Suburban street, intensity",
-                    "pace": "editorial realism, news footage aesthetic, 24fps, grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "attic interior, evidence of negligent installation",
-                    "lighting": "motivated hatch light 3200K",
-                    "atmosphere": "poorly installed insulation, shortcuts visible",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Attic floor with gaps in insulation, improper installation, bare spots",
-                    "ambient": "Evidence of contractor shortcuts",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "properly insulated home interior",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "comfortable well-maintained home",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window, comfort after proper installation",
-                    "ambient": "Clean comfortable interior",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "house_fire",
-            "themes": ["damage", "insulation", "energy"],
-            "mood": "fire",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "suburban neighborhood, emergency vehicles",
-                    "lighting": "orange fire glow 2000K mixed with blue emergency lights",
-                    "atmosphere": "flames visible through windows, firefighters at scene",
-                    "composition": "24mm WS, deep focus f/8",
-                    "camera": "slow dolly 6 in/sec",
-                    "subject": "Residential house with flames visible through windows, firefighters",
-                    "ambient": "Emergency scene atmosphere",
-                    "pace": "editorial realism, emergency footage, 24fps, grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "attic interior showing fire risk or damage",
-                    "lighting": "motivated light 3200K, harsh shadows",
-                    "atmosphere": "old wiring near insulation, fire hazard indicators",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Attic floor with old insulation near electrical, potential hazard area",
-                    "ambient": "Warning signs in attic",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "safe comfortable home interior",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "protected home, safety restored",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window with sheer curtain, safe comfortable home",
-                    "ambient": "Warm protected interior",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "flood_damage",
-            "themes": ["damage", "moisture", "insulation"],
-            "mood": "storm",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "residential neighborhood during flood emergency",
-                    "lighting": "overcast gray 4500K, flat diffused light",
-                    "atmosphere": "rising floodwater, debris floating, water covering streets",
-                    "composition": "24mm WS, deep focus f/8",
-                    "camera": "slow dolly 6 in/sec",
-                    "subject": "Rising floodwater approaching houses, water covering streets",
-                    "ambient": "Flood emergency atmosphere",
-                    "pace": "editorial realism, disaster footage, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "attic interior with water damage",
-                    "lighting": "motivated hatch light 3200K",
-                    "atmosphere": "water stains, soaked insulation",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Water-damaged attic, soaked cellulose, stained joists, compromised insulation",
-                    "ambient": "Moisture damage evidence",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "restored dry comfortable living room",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "home restored after damage",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window, comfort restored after remediation",
-                    "ambient": "Clean dry interior",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        },
-        {
-            "name": "luxury_car_crash",
-            "themes": ["energy", "savings", "contractor"],
-            "mood": "dramatic",
-            "clips": [
-                {
-                    "action": "static scene",
-                    "setting": "accident scene, suburban street",
-                    "lighting": "overcast daylight 5000K, even diffusion",
-                    "atmosphere": "crumpled metal, shattered glass",
-                    "composition": "35mm MS, deep focus f/8",
-                    "camera": "slow dolly 6 in/sec",
-                    "subject": "Expensive vehicle with front-end damage, crumpled metal, shattered glass",
-                    "ambient": "Accident scene",
-                    "pace": "editorial realism, accident documentation, 24fps, grain, photorealistic, no text"
-                },
-                {
-                    "action": "static scene",
-                    "setting": "attic interior showing the real problem",
-                    "lighting": "motivated hatch light 3200K",
-                    "atmosphere": "old degraded insulation, inefficiency visible",
-                    "composition": "50mm overhead pointing down, shallow DOF f/2.8",
-                    "camera": "slow push in 0.3 ft/sec",
-                    "subject": "Attic floor with compressed old insulation, gaps, duct disconnects",
-                    "ambient": "Hidden problem revealed",
-                    "pace": "editorial realism, muted tones, 24fps, subtle film grain, photorealistic, no text"
-                },
-                {
-                    "action": "curtain fully still",
-                    "setting": "comfortable efficient home",
-                    "lighting": "soft afternoon light 4300K",
-                    "atmosphere": "properly insulated home, stable temps",
-                    "composition": "35mm MS, shallow DOF f/4",
-                    "camera": "gentle drift less than 1 in/sec",
-                    "subject": "Living room window with sheer curtain, efficient comfortable home",
-                    "ambient": "Stable comfortable interior",
-                    "pace": "editorial realism, HGTV aesthetic, 24fps, subtle film grain, photorealistic, no text"
-                }
-            ]
-        }
-    ],
-
-    "cameras": {
-        "steady": "Slow dolly 6 in/sec or static 0 in/sec. 9:16 vertical.",
-        "dynamic": "Slow push in 0.3-0.5 ft/sec forward. 9:16 vertical.",
-        "handheld": "Gentle drift less than 1 in/sec micro-movement. 9:16 vertical."
-    }
-}
-
 # ═══════════════════════════════════════════════════════════
 # WRITE FILES
 # ═══════════════════════════════════════════════════════════
@@ -520,101 +172,61 @@ scenes_path = BRAND_DIR / "scenes.json"
 
 # Don't overwrite if settings already exist (preserve user edits)
 if not settings_path.exists():
-    settings_path.write_text(json.dumps(settings, indent=2))
+    _write(settings_path, orjson.dumps(settings, option=orjson.OPT_INDENT_2))
     print(f"✓ Created {settings_path}")
 else:
     # Merge: add missing keys without overwriting existing
-    existing = json.loads(settings_path.read_text())
-    updated = False
-    for k, v in settings.items():
-        if k not in existing or not existing[k]:
-            existing[k] = v
-            updated = True
-    if updated:
-        settings_path.write_text(json.dumps(existing, indent=2))
+    existing = orjson.loads(settings_path.read_bytes())
+    merged = {**existing, **{k: v for k, v in settings.items() if not existing.get(k)}}
+    if merged != existing:
+        _write(settings_path, orjson.dumps(merged, option=orjson.OPT_INDENT_2))
         print(f"✓ Updated {settings_path} (merged missing keys)")
     else:
         print(f"⏭ {settings_path} already complete")
 
-# Always update scenes (this is the scene pack)
-scenes_path.write_text(json.dumps(scenes, indent=2))
-print(f"✓ Created {scenes_path}")
+# Always update scenes (this is the scene pack) — unless the pack on disk already matches
+scenes_bytes = _DEFAULT_SCENES_FILE.read_bytes()
+if scenes_path.exists() and scenes_path.read_bytes() == scenes_bytes:
+    print(f"⏭ {scenes_path} unchanged")
+else:
+    _write(scenes_path, scenes_bytes)
+    print(f"✓ Wrote {scenes_path}")
 
 # ═══════════════════════════════════════════════════════════
 # TOPICS (from Airtable export)
 # ═══════════════════════════════════════════════════════════
-import time, random
-from datetime import datetime
+import time
+from phases.topics import new_topic
 
-TOPICS_RAW = """What's Really Hiding in Your Attic Insulation?	Shocking Revelations
-The Toxic Truth About Old Attic Insulation	Shocking Revelations
-Why Your Attic Is Costing You Thousands Every Year	Shocking Revelations
-Energy Company Secrets They Don't Want You to Know	Shocking Revelations
-This Shocking Insulation Test Changed Everything	Shocking Revelations
-How Contractors REALLY Insulate Attics (Exposed)	Behind-the-Scenes
-What Happens Before Insulation Goes In? You'll Be Shocked	Behind-the-Scenes
-Hidden Costs of Attic Insulation You Never See	Behind-the-Scenes
-Why Most DIY Attic Jobs Fail: Insider Footage	Behind-the-Scenes
-Behind the Attic Walls: What Professionals Keep Quiet	Behind-the-Scenes
-Fiberglass vs Blown in insulation: The Big Insulation Lie	Myths Debunked
-You Don't Need New Insulation? The Myth Exposed	Myths Debunked
-R-Value Is a Scam? Insulation Myths Debunked	Myths Debunked
-Hot Attic in Summer? This Common Tip Doesn't Work	Myths Debunked
-Why More Insulation Might Make Things Worse	Myths Debunked
-No One Talks About This Attic Fire Hazard	Hidden Truths
-The #1 Mistake Every Homeowner Makes in the Attic	Hidden Truths
-Insulation That Attracts Pests? Yes, It Exists	Hidden Truths
-Your Attic Could Be Making You Sick	Hidden Truths
-The Shocking Link Between Attic Air and Allergies	Hidden Truths
-Attic Before vs After: Insulation That Saved $400/mo	Transformations
-Watch This Crumbling Attic Become Energy Efficient	Transformations
-One Day Insulation Transformation—Start to Finish	Transformations
-From Nightmare to Dream Attic in 24 Hours	Transformations
-We Sealed This Attic: See the Stunning Results	Transformations
-Why Blown-In Insulation Is Overrated (And What's Better)	Hot Takes
-Stop Using Fiberglass—Here's Why It's Dangerous	Hot Takes
-Your Energy Bill Isn't High—Your Attic Is Useless	Hot Takes
-Insulating in Summer Is a Waste—Controversial Truth	Hot Takes
-Attic Ventilation Is a Scam? Not Everyone Agrees	Hot Takes"""
+TOPICS = orjson.loads(_DEFAULT_TOPICS_FILE.read_bytes())
 
 topics_path = BRAND_DIR / "topics.json"
 existing_topics = []
 if topics_path.exists():
-    try: existing_topics = json.loads(topics_path.read_text())
+    try: existing_topics = orjson.loads(topics_path.read_bytes())
     except: pass
 
 existing_ideas = {t.get("idea", "").lower().strip() for t in existing_topics}
 added = 0
+# base+i keeps the new IDs unique and ordered without sleeping between them
+base = int(time.time()*1000)
 
-for line in TOPICS_RAW.strip().split("\n"):
-    line = line.strip()
-    if not line or "\t" not in line:
-        continue
-    idea, category = line.rsplit("\t", 1)
-    idea = idea.strip()
-    category = category.strip()
+for t in TOPICS:
+    idea, category = t["idea"], t["category"]
     if idea.lower() in existing_ideas:
         continue
-    topic = {
-        "id": f"t_{int(time.time()*1000)}_{random.randint(100,999)}",
-        "idea": idea,
-        "category": category,
-        "scripture": "",
-        "status": "new",
-        "created": datetime.now().isoformat()
-    }
-    existing_topics.append(topic)
+    existing_topics.append(new_topic(idea, category, ts=base + added))
     existing_ideas.add(idea.lower())
     added += 1
-    time.sleep(0.002)  # ensure unique IDs
 
 if added > 0:
-    topics_path.write_text(json.dumps(existing_topics, indent=2))
+    _write(topics_path, orjson.dumps(existing_topics, option=orjson.OPT_INDENT_2))
     print(f"✓ Added {added} topics to {topics_path}")
 else:
     print(f"⏭ All {len(existing_topics)} topics already present")
 
 print(f"\n✅ Attic Magic brand seeded:")
 print(f"   Settings: {len(settings)} keys")
+scenes = orjson.loads(scenes_bytes)
 print(f"   Scenes: {len(scenes['stories'])} stories, {len(scenes['figures'])} figures, {len(scenes['themes'])} themes, {len(scenes['moods'])} moods")
 print(f"   Topics: {len(existing_topics)} total ({added} new)")
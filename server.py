@@ -4,25 +4,32 @@ Full admin dashboard: Pipeline, Topics, Runs, Logs, Settings, Credentials, Healt
 Phase 2: Topic DB, Prompt Editing Gates, Video Approval Gates
 """
 
-import json, os, threading, time, hashlib, hmac, base64, logging
+import json, os, threading, time, hashlib, hmac, base64, logging, asyncio, gzip, copy
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from fastapi import FastAPI, BackgroundTasks, Request, UploadFile, File
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
+import orjson
 
 from pipeline import (
     run_pipeline, Config, DATA_DIR as PIPELINE_DATA_DIR,
     load_topics, save_topics, add_topic, delete_topic,
     fetch_next_topic, generate_topics_ai, seed_default_topics,
-    generate_video_single,
+    generate_video_single, load_checkpoint, write_checkpoint,
 )
 import secrets
 import requests as _rq
 
 ap_log = logging.getLogger("autopost")
 
-app = FastAPI(title="Knights Reactor")
+app = FastAPI(title="Knights Reactor", default_response_class=ORJSONResponse)
+
+# This process serves /api/webhook/replicate, so its Replicate polls can be woken by callbacks
+from phases.media import enable_webhooks
+enable_webhooks()
 
 # ─── STATIC FILES & SUB-APPS ─────────────────────────────────
 from fastapi.staticfiles import StaticFiles
@@ -90,16 +97,29 @@ def SETTINGS_FILE(): return brand_dir() / "settings.json"
 def RUNS_FILE():   return brand_dir() / "runs.json"
 def TOPICS_FILE(): return brand_dir() / "topics.json"
 
+# Parsed JSON keyed on path, reused while the file's (mtime_ns, size) is unchanged.
+# Callers get their own deep copy, so mutating a result (even without a save) can't leak into the cache.
+_JSON_CACHE = {}
+
 def load_json(path, default=None):
     p = path() if callable(path) else path
-    if p.exists():
-        try: return json.loads(p.read_text())
-        except: pass
+    try:
+        st = p.stat()
+        hit = _JSON_CACHE.get(p)
+        if not hit or hit[0] != (st.st_mtime_ns, st.st_size):
+            hit = ((st.st_mtime_ns, st.st_size), orjson.loads(p.read_bytes()))
+            _JSON_CACHE[p] = hit
+        return copy.deepcopy(hit[1])
+    except: pass
     return default if default is not None else {}
 
 def save_json(path, data):
     p = path() if callable(path) else path
-    p.write_text(json.dumps(data, indent=2))
+    # tmp sibling + os.replace: a crash mid-write can't leave a truncated credentials/runs file.
+    # Per-thread tmp name so two concurrent saves of the same file don't share one.
+    tmp = p.with_name(f"{p.name}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    os.replace(tmp, p)
 
 def apply_credentials():
     creds = load_json(CREDS_FILE, {})
@@ -183,7 +203,7 @@ except Exception as e:
 # ─── STATE ────────────────────────────────────────────────────
 RUNS = load_json(RUNS_FILE, []) if RUNS_FILE().exists() else []
 CURRENT_RUN = {"active": False, "result": None, "phase": 0, "phase_name": "", "phases_done": []}
-LOGS = []
+LOGS = deque(maxlen=500)  # oldest entries fall off the front
 
 # Restore last failed run state so Resume works after restart/deploy
 if RUNS:
@@ -193,9 +213,44 @@ if RUNS:
         CURRENT_RUN["result"] = {"status": "failed", "failed_phase": _fp, "error": _last_run.get("error", "Previous run failed")}
         CURRENT_RUN["phases_done"] = list(range(_fp))
 
+# Live dashboard feed — each /api/events stream owns a queue on the server loop;
+# the pipeline thread hands events over with call_soon_threadsafe.
+_EVENT_SUBS = set()
+_EVENT_SUBS_LOCK = threading.Lock()
+
+def _sse(ev):
+    return b"data: " + orjson.dumps(ev, default=str, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+def publish_event(ev):
+    data = _sse(ev)
+    with _EVENT_SUBS_LOCK: subs = list(_EVENT_SUBS)
+    for loop, q in subs:
+        try: loop.call_soon_threadsafe(q.put_nowait, data)
+        except RuntimeError: pass  # loop already closed (shutdown)
+
+def run_status():
+    return {"running": CURRENT_RUN["active"], "phase": CURRENT_RUN.get("phase", 0),
+            "phase_name": CURRENT_RUN.get("phase_name", ""), "phases_done": CURRENT_RUN.get("phases_done", []),
+            "result": CURRENT_RUN.get("result")}
+
 def log_entry(phase, level, msg):
-    LOGS.append({"t": datetime.now().strftime("%H:%M:%S"), "phase": phase, "level": level, "msg": msg})
-    if len(LOGS) > 500: LOGS.pop(0)
+    entry = {"t": datetime.now().strftime("%H:%M:%S"), "phase": phase, "level": level, "msg": msg}
+    LOGS.append(entry)
+    publish_event({"type": "log", **entry})
+
+# Runs get their own worker thread instead of Starlette's shared threadpool, so a
+# 10-minute render doesn't hold a slot that sync routes and uploads also need.
+_PIPELINE_POOL = ThreadPoolExecutor(1, "pipeline")
+
+def _log_pipeline_crash(fut):
+    e = fut.exception()
+    if e:
+        CURRENT_RUN.update({"active": False, "result": {"status": "failed", "failed_phase": CURRENT_RUN.get("phase", 0), "error": str(e)}})
+        log_entry("System", "error", f"Pipeline crashed: {e!r}")
+        publish_event({"type": "status", **run_status()})
+
+def start_pipeline(*args):
+    _PIPELINE_POOL.submit(execute_pipeline, *args).add_done_callback(_log_pipeline_crash)
 
 def execute_pipeline(resume_from: int = 0, topic_id: str = None, manual_clips: list = None, manual_voiceover: str = None):
     apply_model_settings()  # Reload model selections before each run
@@ -203,6 +258,7 @@ def execute_pipeline(resume_from: int = 0, topic_id: str = None, manual_clips: l
     CURRENT_RUN.update({"active": True, "started": datetime.now().isoformat(), "result": None, "phase": 0, "phase_name": "", "phases_done": []})
     if resume_from == 0:
         LOGS.clear()
+    publish_event({"type": "status", **run_status()})
     log_entry("System", "info", f"Pipeline {mode} mode{' (topic: '+topic_id+')' if topic_id else ''}{' — '+str(len(manual_clips))+' clips' if manual_clips else ''}{' + voiceover' if manual_voiceover else ''}")
 
     def on_phase(phase_index, phase_name, status):
@@ -214,6 +270,7 @@ def execute_pipeline(resume_from: int = 0, topic_id: str = None, manual_clips: l
             if phase_index not in CURRENT_RUN["phases_done"]:
                 CURRENT_RUN["phases_done"].append(phase_index)
             log_entry(phase_name, "ok", f"Complete ✓")
+        publish_event({"type": "status", **run_status()})
 
     result = run_pipeline(progress_cb=on_phase, resume_from=resume_from, topic_id=topic_id, manual_clips=manual_clips, manual_voiceover=manual_voiceover)
 
@@ -222,6 +279,7 @@ def execute_pipeline(resume_from: int = 0, topic_id: str = None, manual_clips: l
     if gate:
         CURRENT_RUN.update({"active": False, "result": result})
         log_entry("System", "info", f"⏸️ Gate: {gate} — awaiting approval")
+        publish_event({"type": "status", **run_status()})
         return
 
     CURRENT_RUN.update({"active": False, "result": result})
@@ -235,6 +293,7 @@ def execute_pipeline(resume_from: int = 0, topic_id: str = None, manual_clips: l
     RUNS.insert(0, run_entry)
     save_json(RUNS_FILE, RUNS[:100])
     log_entry("System", "ok" if result.get("status") in ("published","complete") else "error", f"Pipeline finished: {result.get('status')}")
+    publish_event({"type": "status", **run_status()})
 
 # ══════════════════════════════════════════════════════════════
 # AUTOPOST v2 — Brand-aware Dropbox → Blotato image publisher
@@ -787,7 +846,7 @@ async def seed_default_scenes():
 @app.get("/api/scenes/summary")
 async def scenes_summary():
     """Quick summary of the active brand's scene pack."""
-    from phases.scenes import load_brand_scenes, STORY_SEEDS, FIGURES
+    from phases.scenes import load_brand_scenes, default_story_seeds, FIGURES
     data = load_brand_scenes()
     if data:
         stories = data.get("stories", [])
@@ -801,11 +860,11 @@ async def scenes_summary():
         }
     return {
         "source": "default (knights)",
-        "stories": len(STORY_SEEDS),
+        "stories": len(default_story_seeds()),
         "figures": len(FIGURES),
         "moods": ["storm", "fire", "dawn", "night", "grey", "battle"],
         "themes": ["temptation", "endurance", "doubt", "discipline", "courage", "duty", "loss", "patience", "anger", "identity"],
-        "story_names": [s["name"] for s in STORY_SEEDS],
+        "story_names": [s["name"] for s in default_story_seeds()],
     }
 
 @app.post("/api/deploy")
@@ -863,17 +922,17 @@ async def deploy_files(req: Request):
     return {"status": "deployed", "files": results, "message": message}
 
 @app.post("/api/run")
-async def trigger_run(bg: BackgroundTasks, req: Request):
+async def trigger_run(req: Request):
     if CURRENT_RUN["active"]: return JSONResponse({"error": "Already running"}, 409)
     body = {}
     try: body = await req.json()
     except: pass
     topic_id = body.get("topic_id")
-    bg.add_task(execute_pipeline, 0, topic_id)
+    start_pipeline(0, topic_id)
     return {"status": "started", "topic_id": topic_id}
 
 @app.post("/api/resume")
-async def trigger_resume(bg: BackgroundTasks):
+async def trigger_resume():
     """Resume pipeline from the last failed/gated phase."""
     if CURRENT_RUN["active"]: return JSONResponse({"error": "Already running"}, 409)
     last_result = CURRENT_RUN.get("result", {}) or {}
@@ -882,11 +941,11 @@ async def trigger_resume(bg: BackgroundTasks):
     ckpt_path = brand_dir() / "pipeline_checkpoint.json"
     if not ckpt_path.exists():
         return JSONResponse({"error": "No checkpoint found — run fresh pipeline instead"}, 400)
-    bg.add_task(execute_pipeline, resume_phase)
+    start_pipeline(resume_phase)
     return {"status": "resuming", "from_phase": resume_phase}
 
 @app.post("/api/manual-run")
-async def trigger_manual_run(bg: BackgroundTasks, req: Request):
+async def trigger_manual_run(req: Request):
     """Run pipeline with user-provided video clips and optional voiceover."""
     if CURRENT_RUN["active"]: return JSONResponse({"error": "Already running"}, 409)
     body = await req.json()
@@ -911,7 +970,7 @@ async def trigger_manual_run(bg: BackgroundTasks, req: Request):
     mode = "full-manual" if vo else "manual"
     if vo:
         topic_id = None  # Full manual doesn't need a topic
-    bg.add_task(execute_pipeline, 0, topic_id, valid, vo)
+    start_pipeline(0, topic_id, valid, vo)
     return {"status": "started", "mode": mode, "clips": len(valid), "voiceover": bool(vo), "cta": bool(cta_url)}
 
 @app.post("/api/script-only")
@@ -974,7 +1033,7 @@ async def get_prompts():
     ckpt_path = brand_dir() / "pipeline_checkpoint.json"
     if not ckpt_path.exists():
         return {"clips": [], "error": "No checkpoint"}
-    ckpt = json.loads(ckpt_path.read_text())
+    ckpt = load_checkpoint(ckpt_path)
     clips = ckpt.get("clips", [])
     script = ckpt.get("script", {})
     topic = ckpt.get("topic", {})
@@ -988,9 +1047,9 @@ async def save_prompts(req: Request):
     ckpt_path = brand_dir() / "pipeline_checkpoint.json"
     if not ckpt_path.exists():
         return JSONResponse({"error": "No checkpoint"}, 400)
-    ckpt = json.loads(ckpt_path.read_text())
+    ckpt = load_checkpoint(ckpt_path)
     ckpt["clips_edited"] = edited_clips
-    ckpt_path.write_text(json.dumps(ckpt))
+    write_checkpoint(ckpt_path, ckpt)
     return {"status": "saved", "clips": len(edited_clips)}
 
 # ─── VIDEO APPROVAL GATE ─────────────────────────────────────
@@ -1001,7 +1060,7 @@ async def get_videos_for_review():
     ckpt_path = brand_dir() / "pipeline_checkpoint.json"
     if not ckpt_path.exists():
         return {"clips": [], "error": "No checkpoint"}
-    ckpt = json.loads(ckpt_path.read_text())
+    ckpt = load_checkpoint(ckpt_path)
     clips = ckpt.get("clips_with_videos", [])
     return {"clips": clips}
 
@@ -1013,9 +1072,9 @@ async def approve_videos(req: Request):
     ckpt_path = brand_dir() / "pipeline_checkpoint.json"
     if not ckpt_path.exists():
         return JSONResponse({"error": "No checkpoint"}, 400)
-    ckpt = json.loads(ckpt_path.read_text())
+    ckpt = load_checkpoint(ckpt_path)
     ckpt["clips_approved"] = approved_clips
-    ckpt_path.write_text(json.dumps(ckpt))
+    write_checkpoint(ckpt_path, ckpt)
     return {"status": "approved", "clips": len(approved_clips)}
 
 @app.post("/api/videos/regen")
@@ -1026,7 +1085,7 @@ async def regen_video(req: Request):
     ckpt_path = brand_dir() / "pipeline_checkpoint.json"
     if not ckpt_path.exists():
         return JSONResponse({"error": "No checkpoint"}, 400)
-    ckpt = json.loads(ckpt_path.read_text())
+    ckpt = load_checkpoint(ckpt_path)
     clips = ckpt.get("clips_with_videos", [])
     target = None
     for c in clips:
@@ -1043,7 +1102,7 @@ async def regen_video(req: Request):
                 clips[i] = target
                 break
         ckpt["clips_with_videos"] = clips
-        ckpt_path.write_text(json.dumps(ckpt))
+        write_checkpoint(ckpt_path, ckpt)
         return {"status": "regenerated", "clip": target}
     except Exception as e:
         return JSONResponse({"error": str(e)}, 500)
@@ -1094,6 +1153,14 @@ async def upload_file(file: UploadFile = File(...)):
     log_entry("Upload", "ok", f"Uploaded {file.filename} → {key} ({len(data)//1024}KB)")
     return {"url": url, "filename": file.filename, "size": len(data), "content_type": ct}
 
+@app.post("/api/webhook/replicate")
+async def replicate_webhook_notify(req: Request):
+    """Replicate 'completed' callback — wakes the matching poller in phases.media."""
+    from phases.media import replicate_webhook
+    try: replicate_webhook(await req.json())
+    except Exception: pass
+    return {"ok": True}
+
 @app.post("/api/probe")
 async def probe_media(req: Request):
     """Probe a video/audio URL via Shotstack to get duration."""
@@ -1125,16 +1192,29 @@ async def probe_media(req: Request):
         return JSONResponse({"error": str(e)}, 500)
 
 @app.get("/api/status")
-async def get_status():
-    return {"running": CURRENT_RUN["active"], "phase": CURRENT_RUN.get("phase", 0),
-            "phase_name": CURRENT_RUN.get("phase_name", ""), "phases_done": CURRENT_RUN.get("phases_done", []),
-            "result": CURRENT_RUN.get("result")}
+async def get_status(): return run_status()
+
+@app.get("/api/events")
+async def stream_events():
+    """Server-sent status + log events for the dashboard (replaces polling /api/status)."""
+    async def gen():
+        sub = (asyncio.get_running_loop(), asyncio.Queue())
+        with _EVENT_SUBS_LOCK: _EVENT_SUBS.add(sub)
+        try:
+            yield _sse({"type": "status", **run_status()})
+            while True:
+                try: yield await asyncio.wait_for(sub[1].get(), 15)
+                except asyncio.TimeoutError: yield b": ping\n\n"
+        finally:
+            with _EVENT_SUBS_LOCK: _EVENT_SUBS.discard(sub)
+    return StreamingResponse(gen(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.get("/api/runs")
 async def get_runs(): return RUNS[:50]
 
 @app.get("/api/logs")
-async def get_logs(): return LOGS[-200:]
+async def get_logs(): return list(LOGS)[-200:]
 
 @app.get("/api/config")
 async def get_config():
@@ -1145,20 +1225,24 @@ async def get_config():
 @app.get("/api/credentials")
 async def get_credentials():
     """Return which creds are set (True/False only, never actual values)."""
-    creds = load_json(CREDS_FILE, {})
+    creds = await asyncio.to_thread(load_json, CREDS_FILE, {})
     status = {}
     for k, v in creds.items():
         status[k] = bool(v and len(str(v).strip()) > 0)
     return status
 
-@app.post("/api/credentials")
-async def save_credentials(req: Request):
-    body = await req.json()
+# Disk reads/writes behind these routes run via asyncio.to_thread so a slow
+# persistent disk doesn't stall the event loop (and every open SSE stream).
+def _store_credentials(body):
     existing = load_json(CREDS_FILE, {})
     for k, v in body.items():
         if v is not None: existing[k] = v
     save_json(CREDS_FILE, existing)
     apply_credentials()
+
+@app.post("/api/credentials")
+async def save_credentials(req: Request):
+    await asyncio.to_thread(_store_credentials, await req.json())
     return {"status": "saved"}
 
 @app.post("/api/login")
@@ -1175,7 +1259,7 @@ async def login(req: Request):
     return JSONResponse({"ok": False, "error": "Wrong password"}, 401)
 
 @app.get("/api/settings")
-async def get_settings(): return load_json(SETTINGS_FILE, {})
+async def get_settings(): return await asyncio.to_thread(load_json, SETTINGS_FILE, {})
 
 @app.get("/api/last-result")
 async def get_last_result():
@@ -1184,40 +1268,54 @@ async def get_last_result():
 
 @app.post("/api/settings")
 async def save_settings(req: Request):
-    save_json(SETTINGS_FILE, await req.json())
-    apply_model_settings()
+    body = await req.json()
+    def store():
+        save_json(SETTINGS_FILE, body)
+        apply_model_settings()
+    await asyncio.to_thread(store)
     return {"status": "saved"}
 
+# service -> (probe URL, headers built at call time so freshly saved keys are used)
+_CONN_TESTS = {
+    "openai": ("https://api.openai.com/v1/models", lambda: {"Authorization": f"Bearer {Config.OPENAI_KEY}"}),
+    "replicate": ("https://api.replicate.com/v1/models", lambda: {"Authorization": f"Bearer {Config.REPLICATE_TOKEN}"}),
+    "elevenlabs": ("https://api.elevenlabs.io/v1/voices", lambda: {"xi-api-key": Config.ELEVEN_KEY}),
+}
+
 @app.post("/api/test-connection")
 async def test_conn(req: Request):
     body = await req.json()
-    svc = body.get("service", "")
-    import requests as rq
+    test = _CONN_TESTS.get(body.get("service", ""))
+    if not test: return {"ok": False, "error": "Unknown"}
+    url, headers = test
+    # Blocking probe runs in a worker thread so a slow API can't stall the event loop
     try:
-        if svc == "openai":
-            r = rq.get("https://api.openai.com/v1/models", headers={"Authorization": f"Bearer {Config.OPENAI_KEY}"}, timeout=10)
-            return {"ok": r.status_code == 200}
-        if svc == "replicate":
-            r = rq.get("https://api.replicate.com/v1/models", headers={"Authorization": f"Bearer {Config.REPLICATE_TOKEN}"}, timeout=10)
-            return {"ok": r.status_code == 200}
-        if svc == "elevenlabs":
-            r = rq.get("https://api.elevenlabs.io/v1/voices", headers={"xi-api-key": Config.ELEVEN_KEY}, timeout=10)
-            return {"ok": r.status_code == 200}
-        return {"ok": False, "error": "Unknown"}
+        r = await asyncio.to_thread(_rq.get, url, headers=headers(), timeout=10)
+        return {"ok": r.status_code == 200}
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 # ─── DASHBOARD ────────────────────────────────────────────────
 @app.get("/", response_class=HTMLResponse)
-async def dashboard(): return HTML
+async def dashboard(req: Request):
+    if req.headers.get("if-none-match") == HTML_ETAG:
+        return Response(status_code=304, headers=_HTML_HEADERS)
+    if "gzip" in req.headers.get("accept-encoding", ""):
+        return HTMLResponse(HTML_GZ, headers={**_HTML_HEADERS, "Content-Encoding": "gzip"})
+    return HTMLResponse(HTML_BYTES, headers=_HTML_HEADERS)
 
 
-# Load HTML from external file
+# Load HTML from external file — encoded and hashed once; the ETag lets reloads come back as 304s
 _html_path = Path(__file__).parent / "dashboard.html"
 if _html_path.exists():
     HTML = _html_path.read_text()
 else:
     HTML = "<h1>Dashboard not found</h1><p>Place dashboard.html next to server.py</p>"
+HTML_BYTES = HTML.encode()
+HTML_GZ = gzip.compress(HTML_BYTES, 9)
+# Weak ETag: the gzip and identity bodies are the same page
+HTML_ETAG = f'W/"{hashlib.blake2b(HTML_BYTES, digest_size=8).hexdigest()}"'
+_HTML_HEADERS = {"ETag": HTML_ETAG, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}  # revalidate, so a deploy shows up at once
 
 
 if __name__ == "__main__":